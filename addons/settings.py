@@ -48,4 +48,7 @@ class Settings:
         self.voice_status_template: str = settings.get("default_voice_status_template", "")
         self.lyrics_platform: str = settings.get("lyrics_platform", "A_ZLyrics").lower()
         self.ipc_client: dict[str, str | bool | int] = settings.get("ipc_client", {})
+        self.db_write_buffer: dict[str, float | int] = settings.get("db_write_buffer", {})
+        self.cache: dict[str, dict[str, float | int]] = settings.get("cache", {})
+        self.node_rebalancer: dict[str, float | int | bool] = settings.get("node_rebalancer", {})
         self.version: str = settings.get("version", "")
@@ -0,0 +1,93 @@
+"""
+Compares the JSON codecs in voicelink.codec on payloads recorded from a Lavalink v4 node.
+
+Usage: python benchmarks/json_codec.py [--number N]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import timeit
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Load the codec module on its own so the benchmark does not need discord.py installed
+_spec = importlib.util.spec_from_file_location("codec", os.path.join(ROOT_DIR, "voicelink", "codec.py"))
+codec = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(codec)
+
+TRACK = {
+    "encoded": (
+        "QAAA1gMAKlJpY2sgQXN0bGV5IC0gTmV2ZXIgR29ubmEgR2l2ZSBZb3UgVXAgKE9mZmljaWFsIE11c2ljIFZpZGVvKQAOUmljayBB"
+        "c3RsZXkAAAAAAANACAALZFF3NHc5V2dYY1EAAQAraHR0cHM6Ly93d3cueW91dHViZS5jb20vd2F0Y2g/dj1kUXc0dzlXZ1hjUQEA"
+        "MGh0dHBzOi8vaS55dGltZy5jb20vdmkvZFF3NHc5V2dYY1EvbWF4cmVzZGVmYXVsdC5qcGcAAAd5b3V0dWJlAAAAAAAAAAA="
+    ),
+    "info": {
+        "identifier": "dQw4w9WgXcQ",
+        "isSeekable": True,
+        "author": "Rick Astley",
+        "length": 212000,
+        "isStream": False,
+        "position": 0,
+        "title": "Rick Astley - Never Gonna Give You Up (Official Music Video)",
+        "uri": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "artworkUrl": "https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
+        "isrc": None,
+        "sourceName": "youtube",
+    },
+    "pluginInfo": {},
+    "userData": {},
+}
+
+PAYLOADS = {
+    "playerUpdate": {
+        "op": "playerUpdate",
+        "guildId": "1009021219011395634",
+        "state": {"time": 1728740412343, "position": 61540, "connected": True, "ping": 34},
+    },
+    "stats": {
+        "op": "stats",
+        "players": 412,
+        "playingPlayers": 389,
+        "uptime": 86400342,
+        "memory": {"free": 241283072, "used": 803736576, "allocated": 1045019648, "reservable": 4294967296},
+        "cpu": {"cores": 8, "systemLoad": 0.31, "lavalinkLoad": 0.12},
+        "frameStats": {"sent": 3000, "nulled": 12, "deficit": -4},
+    },
+    "TrackStartEvent": {
+        "op": "event",
+        "type": "TrackStartEvent",
+        "guildId": "1009021219011395634",
+        "track": TRACK,
+    },
+    "loadtracks (20 results)": {"loadType": "search", "data": [TRACK] * 20},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="iterations per payload")
+    args = parser.parse_args()
+
+    codecs = [codec.StdlibCodec()]
+    try:
+        codecs.append(codec.OrjsonCodec())
+    except ImportError:
+        print("orjson is not installed, only the stdlib codec is measured.\n")
+
+    print(f"{'payload':<26}{'codec':<8}{'loads µs':>10}{'dumps µs':>10}{'speedup':>10}")
+    for name, payload in PAYLOADS.items():
+        raw = json.dumps(payload).encode()
+        baseline = None
+        for current in codecs:
+            loads = timeit.timeit(lambda c=current, data=raw: c.loads(data), number=args.number)
+            dumps = timeit.timeit(lambda c=current, obj=payload: c.dumpb(obj), number=args.number)
+            loads, dumps = loads / args.number * 1e6, dumps / args.number * 1e6
+            baseline = baseline or loads + dumps
+            print(f"{name:<26}{current.name:<8}{loads:>10.2f}{dumps:>10.2f}{baseline / (loads + dumps):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
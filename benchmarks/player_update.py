@@ -0,0 +1,87 @@
+"""
+Measures the cost of handling a single Lavalink playerUpdate in Player._update_state.
+
+Usage: python benchmarks/player_update.py [--number N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import timeit
+import tracemalloc
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voicelink import Player
+
+
+PAYLOAD = {
+    "op": "playerUpdate",
+    "guildId": "1009021219011395634",
+    "state": {"time": 1728740412343, "position": 61540, "connected": True, "ping": 34},
+}
+
+
+class Guild:
+    id = 1009021219011395634
+    name = "Benchmark"
+
+
+class Publisher:
+    def __init__(self) -> None:
+        self._pending = {}
+
+    def mark(self, player: Player) -> None:
+        """Record the player like the IPC publisher does, without sending anything."""
+        self._pending[player.guild.id] = player
+
+
+class IPC:
+    _is_connected = True
+
+    def __init__(self) -> None:
+        self.publisher = Publisher()
+
+
+def build_player(ipc_connection: bool) -> Player:
+    # Only the attributes _update_state touches, a real player needs a bot and a voice channel
+    player = Player.__new__(Player)
+    player._guild = Guild()
+    player._logger = logging.getLogger("voicelink")
+    player._ipc = IPC()
+    player._ipc_connection = ipc_connection
+    return player
+
+
+def measure(player: Player, number: int) -> tuple[float, int]:
+    player._update_state(PAYLOAD)
+    per_call = timeit.timeit(lambda: player._update_state(PAYLOAD), number=number) / number * 1e9
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(number):
+        player._update_state(PAYLOAD)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    return per_call, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200000, help="updates per scenario")
+    args = parser.parse_args()
+
+    logging.getLogger("voicelink").setLevel(logging.INFO)
+
+    print(f"{'scenario':<28}{'ns/update':>12}{'retained bytes':>16}")
+    for name, ipc_connection in (("no dashboard viewer", False), ("dashboard viewer", True)):
+        per_call, retained = measure(build_player(ipc_connection), args.number)
+        print(f"{name:<28}{per_call:>12.1f}{retained:>16}")
+
+
+if __name__ == "__main__":
+    main()
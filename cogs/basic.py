@@ -714,12 +714,8 @@ class Basic(commands.Cog):
             track_ids = track_ids.decode().split(",")
 
             tracks = [
-                voicelink.Track(
-                    track_id=track_id,
-                    info=voicelink.decode(track_id),
-                    requester=ctx.author,
-                )
-                for track_id in track_ids
+                voicelink.Track(track_id=track_id, info=info, requester=ctx.author)
+                for track_id, info in zip(track_ids, voicelink.decode_many(track_ids), strict=True)
             ]
             if not tracks:
                 return await send(ctx, "noTrackFound")
@@ -1111,7 +1107,7 @@ class Basic(commands.Cog):
             embed.add_field(
                 name=value[2],
                 value=value[3].format(
-                    player.node._identifier,
+                    f"{player.node._identifier} ({player.node.latency:.0f}±{player.node.latency_jitter:.0f}ms)",
                     player.ping,
                     player.node.player_count,
                     player.channel.rtc_region,
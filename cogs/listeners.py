@@ -38,18 +38,39 @@ class Listeners(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.voicelink = voicelink.NodePool()
+        self.rebalancer: voicelink.NodeRebalancer | None = None
 
         bot.loop.create_task(self.start_nodes())
         bot.loop.create_task(self.restore_last_session_players())
 
     async def start_nodes(self) -> None:
         """Connect and intiate nodes."""
+        sessions = func.open_json(func.NODE_SESSIONS_FILE_NAME)
         for n in func.settings.nodes.values():
             try:
-                await self.voicelink.create_node(bot=self.bot, logger=func.logger, **n)
+                await self.voicelink.create_node(
+                    bot=self.bot, logger=func.logger, session_id=sessions.get(n["identifier"]), **n
+                )
             except Exception as e:
                 func.logger.error(f"Node {n['identifier']} is not able to connect! - Reason: {e}")
 
+        config = func.settings.node_rebalancer
+        if config.get("enable", False):
+            self.rebalancer = voicelink.NodeRebalancer(
+                logger=func.logger, **{key: value for key, value in config.items() if key != "enable"}
+            )
+            self.rebalancer.start()
+
+    async def cog_unload(self) -> None:
+        """Stop the node rebalancer."""
+        if self.rebalancer:
+            self.rebalancer.stop()
+
+    @commands.Cog.listener()
+    async def on_voicelink_session_ready(self, node: voicelink.Node) -> None:
+        """Remember the session so the node can resume it after a restart."""
+        func.update_json(func.NODE_SESSIONS_FILE_NAME, {node._identifier: node._session_id})
+
     async def restore_last_session_players(self) -> None:
         """Re-establish connections for players from the last session."""
         await self.bot.wait_until_ready()
@@ -81,15 +102,12 @@ class Listeners(commands.Cog):
 
                 # Restore the queue.
                 queue_data = data.get("queue", {})
-                for track_data in queue_data.get("tracks", []):
-                    track_id = track_data.get("track_id")
-                    if not track_id:
-                        continue
-
-                    decoded_track = voicelink.decode(track_id)
+                tracks_data = [track_data for track_data in queue_data.get("tracks", []) if track_data.get("track_id")]
+                decoded_tracks = voicelink.decode_many(track_data["track_id"] for track_data in tracks_data)
+                for track_data, decoded_track in zip(tracks_data, decoded_tracks, strict=True):
                     requester = channel.guild.get_member(track_data.get("requester_id"))
-                    track = voicelink.Track(track_id=track_id, info=decoded_track, requester=requester)
-                    player.queue._queue.append(track)
+                    track = voicelink.Track(track_id=track_data["track_id"], info=decoded_track, requester=requester)
+                    player.queue._upcoming.append(track)
 
                 # Restore queue settings.
                 player.queue._position = queue_data.get("position", 0) - 1
@@ -99,7 +117,7 @@ class Listeners(commands.Cog):
                 except KeyError:
                     loop_mode = voicelink.LoopType.OFF
                 player.queue._repeat.set_mode(loop_mode)
-                player.queue._repeat_position = queue_data.get("repeat_position")
+                player.queue._repeat_position = queue_data.get("repeat_position", 0)
 
                 # Restore player settings
                 player.dj = dj_member
@@ -107,13 +125,16 @@ class Listeners(commands.Cog):
 
                 # Resume playback or invoke the controller based on the player's state.
                 if not player.is_playing:
+                    resumed = player.node._resumed_players.get(channel.guild.id)
                     await player.do_next()
 
-                    if is_paused := data.get("is_paused"):
-                        await player.set_pause(is_paused, self.bot.user)
+                    # A player resumed from the node session already has the right position and pause state
+                    if not (resumed and player.current and resumed["track"]["encoded"] == player.current.track_id):
+                        if is_paused := data.get("is_paused"):
+                            await player.set_pause(is_paused, self.bot.user)
 
-                    if position := data.get("position"):
-                        await player.seek(int(position), self.bot.user)
+                        if position := data.get("position"):
+                            await player.seek(int(position), self.bot.user)
 
                 await asyncio.sleep(5)
 
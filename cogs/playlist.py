@@ -31,12 +31,19 @@ from discord.ext import commands
 
 import voicelink
 from function import (
+    add_playlist_tracks,
     check_roles,
+    clear_playlist_tracks,
     cooldown_check,
+    delete_playlist,
     get_aliases,
     get_lang,
+    get_playlist_tracks,
     get_user,
     logger,
+    playlist_length,
+    playlist_size,
+    remove_playlist_track,
     send,
     settings,
     time as ctime,
@@ -70,16 +77,18 @@ async def check_playlist(
         return user
 
     if not name:
-        return {"playlist": user["200"], "position": 1, "id": "200"}
+        return {"playlist": user["200"], "position": 1, "id": "200", "source": (ctx.author.id, "200")}
 
     for index, data in enumerate(user, start=1):
         playlist = user[data]
         if playlist["name"].lower() == name:
+            source = (ctx.author.id, data)
             if playlist["type"] == "share" and share:
+                source = (playlist["user"], playlist["referId"])
                 playlist = await check_playlist_perms(ctx.author.id, playlist["user"], playlist["referId"])
                 if not playlist or ctx.author.id not in playlist["perms"]["read"]:
                     return {"playlist": None, "position": index, "id": data}
-            return {"playlist": playlist, "position": index, "id": data}
+            return {"playlist": playlist, "position": index, "id": data, "source": source}
     return {"playlist": None, "position": None, "id": None}
 
 
@@ -142,18 +151,18 @@ class Playlists(commands.Cog, name="playlist"):
         if result["playlist"]["type"] == "link":
             tracks = await search_playlist(result["playlist"]["uri"], ctx.author, time_needed=False)
         else:
-            if not result["playlist"]["tracks"]:
+            if not playlist_size(result["playlist"]):
                 return await send(ctx, "playlistNoTrack", result["playlist"]["name"], ephemeral=True)
 
-            _tracks = []
-            for track in result["playlist"]["tracks"][:max_t]:
-                _tracks.append(
-                    voicelink.Track(
-                        track_id=track,
-                        info=voicelink.decode(track),
-                        requester=ctx.author,
-                    )
-                )
+            if value and 0 < value <= min(playlist_size(result["playlist"]), max_t):
+                track_ids = await get_playlist_tracks(*result["source"], value - 1, value)
+                value = None
+            else:
+                track_ids = await get_playlist_tracks(*result["source"], 0, max_t)
+            _tracks = [
+                voicelink.Track(track_id=track_id, info=info, requester=ctx.author)
+                for track_id, info in zip(track_ids, voicelink.decode_many(track_ids), strict=True)
+            ]
 
             tracks = {"name": result["playlist"]["name"], "tracks": _tracks}
 
@@ -184,7 +193,6 @@ class Playlists(commands.Cog, name="playlist"):
         results = []
         for index, data in enumerate(user, start=1):
             playlist = user[data]
-            time = 0
             try:
                 if playlist["type"] == "link":
                     tracks = await search_playlist(playlist["uri"], requester=ctx.author)
@@ -195,6 +203,7 @@ class Playlists(commands.Cog, name="playlist"):
                             "time": tracks["time"],
                             "name": playlist["name"],
                             "tracks": tracks["tracks"],
+                            "count": len(tracks["tracks"]),
                             "perms": playlist["perms"],
                             "type": playlist["type"],
                         }
@@ -216,6 +225,7 @@ class Playlists(commands.Cog, name="playlist"):
                                     "time": tracks["time"],
                                     "name": user[data]["name"],
                                     "tracks": tracks["tracks"],
+                                    "count": len(tracks["tracks"]),
                                     "perms": playlist["perms"],
                                     "owner": user[data]["user"],
                                     "type": "share",
@@ -223,19 +233,15 @@ class Playlists(commands.Cog, name="playlist"):
                             )
                             continue
 
-                    init = []
-                    for track in playlist["tracks"]:
-                        dt = voicelink.decode(track)
-                        time += dt.get("length", 0)
-                        init.append(dt)
-                    playlist["tracks"] = init
+                    # Only the page index is read here, tracks are fetched page by page by the view
                     results.append(
                         {
                             "emoji": ("🔒" if max_p < index else ("🤝" if share else "❤️")),
                             "id": data,
-                            "time": ctime(time),
+                            "time": ctime(playlist_length(playlist)),
                             "name": user[data]["name"],
-                            "tracks": playlist["tracks"],
+                            "source": (user[data]["user"], user[data]["referId"]) if share else (ctx.author.id, data),
+                            "count": playlist_size(playlist),
                             "perms": playlist["perms"],
                             "owner": user[data].get("user", None),
                             "type": user[data]["type"],
@@ -250,6 +256,7 @@ class Playlists(commands.Cog, name="playlist"):
                         "time": "--:--",
                         "name": "Error",
                         "tracks": [],
+                        "count": 0,
                         "type": "error",
                     }
                 )
@@ -269,7 +276,7 @@ class Playlists(commands.Cog, name="playlist"):
                     info["id"],
                     f"[{info['time']}]",
                     info["name"],
-                    f"{len(info['tracks'])}",
+                    f"{info['count']}",
                 )
             except IndexError:
                 track_info = ("🎵", "-" * 3, "[--:--]", "-" * 6, "-")
@@ -311,7 +318,7 @@ class Playlists(commands.Cog, name="playlist"):
             {"uri": link, "perms": {"read": []}, "name": name, "type": "link"}
             if link
             else {
-                "tracks": [],
+                "pages": [],
                 "perms": {"read": [], "write": [], "remove": []},
                 "name": name,
                 "type": "playlist",
@@ -342,7 +349,7 @@ class Playlists(commands.Cog, name="playlist"):
                 {"$pull": {f"playlist.{result['playlist']['referId']}.perms.read": ctx.author.id}},
             )
 
-        await update_user(ctx.author.id, {"$unset": {f"playlist.{result['id']}": 1}})
+        await delete_playlist(ctx.author.id, result["id"])
         return await send(ctx, "playlistRemove", result["playlist"]["name"])
 
     @playlist.command(name="share", aliases=get_aliases("share"))
@@ -367,13 +374,11 @@ class Playlists(commands.Cog, name="playlist"):
         if member.id in result["playlist"]["perms"]["read"]:
             return await send(ctx, "playlistShare", member, ephemeral=True)
 
-        receiver = await get_user(member.id)
-        if not receiver:
-            return await send(ctx, "noPlaylistAcc", member)
-        for mail in receiver["inbox"]:
+        inbox = await get_user(member.id, "inbox")
+        for mail in inbox:
             if mail["sender"] == ctx.author.id and mail["referId"] == result["id"]:
                 return await send(ctx, "playlistSent", ephemeral=True)
-        if len(receiver["inbox"]) >= 10:
+        if len(inbox) >= 10:
             return await send(ctx.guild.id, "inboxFull", member, ephemeral=True)
 
         await update_user(
@@ -469,7 +474,7 @@ class Playlists(commands.Cog, name="playlist"):
             return await send(ctx, "playlistNotAllow", ephemeral=True)
 
         rank, max_p, max_t = check_roles()
-        if len(result["playlist"]["tracks"]) >= max_t:
+        if playlist_size(result["playlist"]) >= max_t:
             return await send(ctx, "playlistLimitTrack", max_t, ephemeral=True)
 
         results = await voicelink.NodePool.get_node().get_tracks(query, requester=ctx.author)
@@ -482,10 +487,7 @@ class Playlists(commands.Cog, name="playlist"):
         if results[0].is_stream:
             return await send(ctx, "playlistStream", ephemeral=True)
 
-        await update_user(
-            ctx.author.id,
-            {"$push": {f"playlist.{result['id']}.tracks": results[0].track_id}},
-        )
+        await add_playlist_tracks(ctx.author.id, result["id"], [results[0].track_id])
         await send(
             ctx,
             "playlistAdded",
@@ -509,15 +511,14 @@ class Playlists(commands.Cog, name="playlist"):
             return await send(ctx, "playlistNotFound", name, ephemeral=True)
         if result["playlist"]["type"] in ["link", "share"]:
             return await send(ctx, "playlistNotAllow", ephemeral=True)
-        if not 0 < position <= len(result["playlist"]["tracks"]):
+        if not 0 < position <= playlist_size(result["playlist"]):
             return await send(ctx, "playlistPositionNotFound", position, name)
 
-        await update_user(
-            ctx.author.id,
-            {"$pull": {f"playlist.{result['id']}.tracks": result["playlist"]["tracks"][position - 1]}},
-        )
+        track_id = await remove_playlist_track(ctx.author.id, result["id"], position - 1)
+        if not track_id:
+            return await send(ctx, "playlistPositionNotFound", position, name)
 
-        track = voicelink.decode(result["playlist"]["tracks"][position - 1])
+        track = voicelink.decode(track_id)
         await send(ctx, "playlistRemoved", track.get("title"), ctx.author, name)
         return None
 
@@ -533,7 +534,7 @@ class Playlists(commands.Cog, name="playlist"):
         if result["playlist"]["type"] in ["link", "share"]:
             return await send(ctx, "playlistNotAllow", ephemeral=True)
 
-        await update_user(ctx.author.id, {"$set": {f"playlist.{result['id']}.tracks": []}})
+        await clear_playlist_tracks(ctx.author.id, result["id"])
         await send(ctx, "playlistClear", name)
         return None
 
@@ -549,18 +550,14 @@ class Playlists(commands.Cog, name="playlist"):
         if result["playlist"]["type"] == "link":
             tracks = await search_playlist(result["playlist"]["uri"], ctx.author, time_needed=False)
         else:
-            if not result["playlist"]["tracks"]:
+            if not playlist_size(result["playlist"]):
                 return await send(ctx, "playlistNoTrack", result["playlist"]["name"], ephemeral=True)
 
-            _tracks = []
-            for track in result["playlist"]["tracks"]:
-                _tracks.append(
-                    voicelink.Track(
-                        track_id=track,
-                        info=voicelink.decode(track),
-                        requester=ctx.author,
-                    )
-                )
+            track_ids = await get_playlist_tracks(*result["source"])
+            _tracks = [
+                voicelink.Track(track_id=track_id, info=info, requester=ctx.author)
+                for track_id, info in zip(track_ids, voicelink.decode_many(track_ids), strict=True)
+            ]
 
             tracks = {"name": result["playlist"]["name"], "tracks": _tracks}
 
@@ -621,15 +618,14 @@ class Playlists(commands.Cog, name="playlist"):
             track_ids = track_ids.decode().split(",")
 
             data = {
-                "tracks": track_ids,
+                "pages": [],
                 "perms": {"read": [], "write": [], "remove": []},
                 "name": name,
                 "type": "playlist",
             }
-            await update_user(
-                ctx.author.id,
-                {"$set": {f"playlist.{assign_playlist_id(list(user))}": data}},
-            )
+            playlist_id = assign_playlist_id(list(user))
+            await update_user(ctx.author.id, {"$set": {f"playlist.{playlist_id}": data}})
+            await add_playlist_tracks(ctx.author.id, playlist_id, track_ids)
             await send(ctx, "playlistCreated", name)
 
         except Exception as e:
@@ -372,7 +372,7 @@ class Settings(commands.Cog, name="settings"):
                     f"• PLAYERS: {len(node._players)}\n"
                     f"• CPU:     {node.stats.cpu_process_load:.1f}%\n"
                     f"• RAM:     {format_bytes(node.stats.free)}/{format_bytes(total_memory, True)} ({(node.stats.free / total_memory) * 100:.1f}%)\n"
-                    f"• LATENCY: {node.latency:.2f}ms\n"
+                    f"• LATENCY: {node.latency:.2f}ms (±{node.latency_jitter:.2f}ms)\n"
                     f"• UPTIME:  {func.time(node.stats.uptime)}```",
                 )
             else:
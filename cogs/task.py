@@ -108,10 +108,11 @@ class Task(commands.Cog):
                 except Exception as e:
                     func.logger.error("Error occurred while checking the player!", exc_info=e)
 
-    @tasks.loop(hours=12.0)
+    @tasks.loop(minutes=10.0)
     async def cache_cleaner(self) -> None:
-        func.SETTINGS_BUFFER.clear()
-        func.USERS_BUFFER.clear()
+        for name, cache in (("settings", func.SETTINGS_CACHE), ("users", func.USERS_CACHE)):
+            cache.purge()
+            func.logger.debug(f"The {name} cache stats: {cache.stats}")
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -22,19 +22,28 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
+import contextlib
 import copy
 import json
 import logging
 import os
-from time import strptime
+import sys
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from time import monotonic, strptime
 from typing import Any
+from weakref import WeakValueDictionary
 
+import bson
 import discord
 from discord.ext import commands
 from motor.motor_asyncio import (
     AsyncIOMotorClient,
     AsyncIOMotorCollection,
 )
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from addons import Settings
 
@@ -51,18 +60,20 @@ logger: logging.Logger = logging.getLogger("vocard")
 MONGO_DB: AsyncIOMotorClient
 SETTINGS_DB: AsyncIOMotorCollection
 USERS_DB: AsyncIOMotorCollection
+PLAYLISTS_DB: AsyncIOMotorCollection
+DB_WRITER: "WriteBehindBuffer"
+SETTINGS_CACHE: "Cache"  # Cache guild settings
+USERS_CACHE: "Cache"
 
 LANGS: dict[str, dict[str, str]] = {}  # Stores all the languages in ./langs
 LOCAL_LANGS: dict[str, dict[str, str]] = {}  # Stores all the localization languages in ./local_langs
-SETTINGS_BUFFER: dict[int, dict[str, Any]] = {}  # Cache guild language
-USERS_BUFFER: dict[str, dict] = {}
 
 MISSING_TRANSLATOR: dict[str, list[str]] = {}
 
 USER_BASE: dict[str, Any] = {
     "playlist": {
         "200": {
-            "tracks": [],
+            "pages": [],
             "perms": {"read": [], "write": [], "remove": []},
             "name": "Favourite",
             "type": "playlist",
@@ -72,11 +83,389 @@ USER_BASE: dict[str, Any] = {
     "inbox": [],
 }
 
+PLAYLIST_PAGE_SIZE: int = 100  # Number of track IDs stored in each playlist page
+PLAYLIST_LOCKS: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+
 ALLOWED_MENTIONS = discord.AllowedMentions().none()
 LAST_SESSION_FILE_NAME = "last-session.json"
+NODE_SESSIONS_FILE_NAME = "node-sessions.json"
 
 
 # -------------- Vocard Classes --------------
+class UserDocument(dict):
+    """A cached user document that may hold only some of its top-level fields."""
+
+    __slots__ = ("resident",)
+
+    def __init__(self, data: dict[str, Any], resident: set[str] | None = None) -> None:
+        super().__init__(data)
+        self.resident: set[str] | None = resident  # None once the whole document is loaded
+
+    def is_resident(self, fields: set[str] | None) -> bool:
+        """Whether the cached document holds all of `fields`, where None asks for the whole document."""
+        return self.resident is None or (fields is not None and fields <= self.resident)
+
+
+class CowDict(dict):
+    """
+    A copy-on-write snapshot of a cached document.
+
+    Only the keys of this level are copied. Nested dicts and lists are wrapped the
+    first time they are reached, so sub-documents a caller never touches are never
+    copied, and writes only ever land in the snapshot, not in the cached original.
+    """
+
+    __slots__ = ()
+
+    def _child(self, key: Hashable) -> Any:
+        value = dict.__getitem__(self, key)
+        if (wrapped := _cow(value)) is not value:
+            dict.__setitem__(self, key, wrapped)
+        return wrapped
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._child(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Like `dict.get`, wrapping a nested value before it is returned."""
+        return self._child(key) if key in self else default
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        """Like `dict.setdefault`, wrapping a nested value before it is returned."""
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self._child(key)
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        """Like `dict.pop`, wrapping a nested value before it is returned."""
+        if key not in self:
+            return dict.pop(self, key, *default)
+
+        value = self._child(key)
+        dict.__delitem__(self, key)
+        return value
+
+    def popitem(self) -> tuple[Hashable, Any]:
+        """Like `dict.popitem`, wrapping a nested value before it is returned."""
+        key, value = dict.popitem(self)
+        return key, _cow(value)
+
+    def values(self) -> list[Any]:
+        """Return the values as a list, with nested values wrapped."""
+        return [self._child(key) for key in self]
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Return the items as a list, with nested values wrapped."""
+        return [(key, self._child(key)) for key in self]
+
+    def copy(self) -> "CowDict":
+        """Return a shallow snapshot sharing the cached values until they are written."""
+        return CowDict(self)
+
+
+class CowList(list):
+    """The list counterpart of `CowDict`."""
+
+    __slots__ = ()
+
+    def _child(self, index: int) -> Any:
+        value = list.__getitem__(self, index)
+        if (wrapped := _cow(value)) is not value:
+            list.__setitem__(self, index, wrapped)
+        return wrapped
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return CowList(list.__getitem__(self, index))
+        return self._child(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index, value in enumerate(list.__iter__(self)):
+            yield self._child(index) if isinstance(value, dict | list) else value
+
+    def __reversed__(self) -> Iterator[Any]:
+        for index in range(len(self) - 1, -1, -1):
+            yield self._child(index)
+
+    def pop(self, index: int = -1) -> Any:
+        """Like `list.pop`, wrapping a nested value before it is returned."""
+        value = self._child(index)
+        list.__delitem__(self, index)
+        return value
+
+    def copy(self) -> "CowList":
+        """Return a shallow snapshot sharing the cached values until they are written."""
+        return CowList(self)
+
+
+class Cache:
+    """
+    An LRU cache with per-entry TTL, bounded by entry count and approximate size in bytes.
+
+    Concurrent misses for the same key passed to `get_or_load` share a single load.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0, max_bytes: int | None = None) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.max_bytes: int | None = max_bytes
+
+        self._data: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+        self._bytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key, _MISSING) is not _MISSING
+
+    def __repr__(self) -> str:
+        return (
+            f"<Cache size={len(self._data)}/{self.maxsize} bytes={self._bytes} "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions} expirations={self.expirations}>"
+        )
+
+    @property
+    def bytes(self) -> int:
+        """Approximate memory held by the cached values."""
+        return self._bytes
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Size and hit counters of the cache."""
+        return {
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def peek(self, key: Hashable, default: Any = None, *, allow_expired: bool = False) -> Any:
+        """
+        Return a live value without touching the metrics or the LRU order.
+
+        With `allow_expired`, an entry past its TTL that has not been purged yet is returned as well.
+        """
+        entry = self._data.get(key)
+        if entry is None or (not allow_expired and entry[1] <= monotonic()):
+            return default
+        return entry[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live value and refresh its TTL, or `default` if it is missing or expired."""
+        entry = self._data.get(key)
+        if entry is not None and entry[1] <= monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        # Reads keep the entry alive, so guilds and users in active use do not fall out between loads
+        self.hits += 1
+        self._data[key] = (entry[0], monotonic() + self.ttl, entry[2])
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, *, remeasure: bool = False) -> None:
+        """
+        Store or refresh a value, restarting its TTL.
+
+        The size is only measured when the key is new or `remeasure` is set. Writing back an updated
+        document keeps its earlier estimate, so updates do not walk the whole document every time.
+        """
+        size = None
+        if key in self._data:
+            _, _, size = self._data[key]
+            self._remove(key)
+
+        if size is None or remeasure:
+            size = _approx_size(value)
+        self._data[key] = (value, monotonic() + self.ttl, size)
+        self._bytes += size
+
+        while len(self._data) > self.maxsize or (
+            self.max_bytes is not None and self._bytes > self.max_bytes and len(self._data) > 1
+        ):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value and return it, or `default` if it is not cached."""
+        if key not in self._data:
+            return default
+        return self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+        self._bytes = 0
+
+    def purge(self) -> int:
+        """Drop every expired entry. Returns how many were removed."""
+        now = monotonic()
+        expired = [key for key, (_, expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+
+        self.expirations += len(expired)
+        return len(expired)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value or load it, coalescing concurrent loads of the same key."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        return await self.load_once(key, lambda: self._load(key, loader))
+
+    async def load_once(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `loader`, sharing the result with any concurrent call made with the same key."""
+        future = self._loading.get(key)
+        if future is None:
+            future = self._loading[key] = asyncio.ensure_future(loader())
+            future.add_done_callback(lambda _: self._loading.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self.put(key, value)
+        return value
+
+    def _remove(self, key: Hashable) -> Any:
+        value, _, size = self._data.pop(key)
+        self._bytes -= size
+        return value
+
+
+class WriteBehindBuffer:
+    """
+    Collects database updates and flushes them in batches with `bulk_write`.
+
+    Updates targeting the same document are merged into a single operation whenever
+    their paths do not conflict, otherwise they are queued in order behind it.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_batch_size: int = 500) -> None:
+        self.flush_interval: float = flush_interval
+        self.max_batch_size: int = max_batch_size
+
+        self._collections: dict[str, AsyncIOMotorCollection] = {}
+        self._pending: dict[str, dict[Any, list[tuple[dict, dict]]]] = {}
+        self._inflight: dict[str, set[Any]] = {}
+        self._size: int = 0
+
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closing: bool = False
+
+    @property
+    def pending(self) -> int:
+        """Number of update operations waiting to be written."""
+        return self._size
+
+    def is_pending(self, db: AsyncIOMotorCollection, filter: dict) -> bool:
+        """Whether an update for the given document is queued or still being written."""
+        key = tuple(sorted(filter.items()))
+        return bool(self._pending.get(db.name, {}).get(key)) or key in self._inflight.get(db.name, ())
+
+    def start(self) -> None:
+        """Start the flush task if it is not running."""
+        if self._task is None or self._task.done():
+            # Once closed there is no loop left to pick up late updates, so they are written right away
+            self._task = asyncio.create_task(self.flush() if self._closing else self._run())
+
+    def add(self, db: AsyncIOMotorCollection, filter: dict, data: dict) -> None:
+        """Queue an update, merging it into a pending one for the same document if possible."""
+        self._collections.setdefault(db.name, db)
+        queued = self._pending.setdefault(db.name, {}).setdefault(tuple(sorted(filter.items())), [])
+
+        if not (queued and _merge_update(queued[-1][1], data)):
+            queued.append((filter, copy.deepcopy(data)))
+            self._size += 1
+
+        if self._size >= self.max_batch_size:
+            self._wakeup.set()
+
+        self.start()
+
+    async def flush(self) -> None:
+        """Write all pending updates to the database."""
+        async with self._lock:
+            pending, self._pending, self._size = self._pending, {}, 0
+
+            # Readers treat these documents as pending until the write lands, flushing waits on the lock
+            self._inflight = {name: set(documents) for name, documents in pending.items()}
+            try:
+                for name, documents in pending.items():
+                    await self._write(name, [(key, op) for key, queued in documents.items() for op in queued])
+            finally:
+                self._inflight = {}
+
+    async def _write(self, name: str, operations: list[tuple[Any, tuple[dict, dict]]]) -> None:
+        # Ordered, so updates to the same document land in the order they were made
+        while operations:
+            try:
+                await self._collections[name].bulk_write(
+                    [UpdateOne(filter, data) for _, (filter, data) in operations], ordered=True
+                )
+                return
+            except BulkWriteError as e:
+                # Everything before the failed update was written and everything after it was not, so only
+                # the failed one is dropped and the rest is written again
+                error = e.details["writeErrors"][0]
+                _, (filter, data) = operations[error["index"]]
+                logger.error(f"Dropped a buffered update to {name} {filter}: {error.get('errmsg')} ({data})")
+                operations = operations[error["index"] + 1 :]
+            except Exception as e:
+                # Nothing tells how far the batch got, keep all of it for the next flush
+                logger.error(f"Failed to write {len(operations)} buffered update(s) to {name}, retrying.", exc_info=e)
+                self._requeue(name, operations)
+                return
+
+    def _requeue(self, name: str, operations: list[tuple[Any, tuple[dict, dict]]]) -> None:
+        requeued: dict[Any, list[tuple[dict, dict]]] = {}
+        for key, op in operations:
+            requeued.setdefault(key, []).append(op)
+
+        # Put them in front of the updates made since, which must still be applied after them
+        documents = self._pending.setdefault(name, {})
+        for key, queued in requeued.items():
+            documents[key] = queued + documents.get(key, [])
+        self._size += len(operations)
+
+    async def close(self) -> None:
+        """Stop the flush task and write whatever is left."""
+        # Let the loop exit on its own, cancelling it could abort a bulk_write that already took its updates
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+
+            self._wakeup.clear()
+            await self.flush()
+
+
 class TempCtx:
     def __init__(self, author: discord.Member, channel: discord.VoiceChannel) -> None:
         self.author: discord.Member = author
@@ -173,7 +562,7 @@ def truncate_string(text: str, length: int = 40) -> str:
 
 
 def get_lang_non_async(guild_id: int, *keys) -> list[str] | str:
-    settings = SETTINGS_BUFFER.get(guild_id, {})
+    settings = SETTINGS_CACHE.peek(guild_id, {}, allow_expired=True)
     lang = settings.get("lang", "EN")
     if lang in LANGS and not LANGS[lang]:
         LANGS[lang] = open_json(os.path.join("langs", f"{lang}.json"))
@@ -254,7 +643,87 @@ async def send(
     )
 
 
+_MISSING = object()
+
+
+def _cow(value: Any) -> Any:
+    if isinstance(value, CowDict | CowList):
+        return value
+    if isinstance(value, dict):
+        return CowDict(value)
+    if isinstance(value, list):
+        return CowList(value)
+    return value
+
+
+def _approx_size(value: Any) -> int:
+    """Roughly estimate the memory used by a document from its BSON size, which is encoded in C."""
+    try:
+        return len(bson.encode(value))
+    except (TypeError, bson.InvalidDocument):
+        return sys.getsizeof(value)
+
+
+def _paths_overlap(path: str, other: str) -> bool:
+    return path == other or path.startswith(other + ".") or other.startswith(path + ".")
+
+
+def _split_push(value: Any) -> tuple[list, dict]:
+    if isinstance(value, dict) and "$each" in value:
+        return list(value["$each"]), {k: v for k, v in value.items() if k != "$each"}
+    return [value], {}
+
+
+def _can_merge(mode: str, value: Any, pending_value: Any) -> bool:
+    if mode in ("$set", "$unset", "$inc"):
+        return True
+
+    if mode == "$push":
+        _, modifiers = _split_push(value)
+        _, pending_modifiers = _split_push(pending_value)
+        return modifiers == pending_modifiers and not modifiers.keys() & {"$position", "$sort"}
+
+    return False
+
+
+def _merge_update(pending: dict, data: dict) -> bool:
+    """Fold `data` into the `pending` update document. Returns False if the two conflict."""
+    for mode, action in data.items():
+        for key, value in action.items():
+            for pending_mode, pending_action in pending.items():
+                for pending_key, pending_value in pending_action.items():
+                    if not _paths_overlap(key, pending_key):
+                        continue
+
+                    if key != pending_key or mode != pending_mode or not _can_merge(mode, value, pending_value):
+                        return False
+
+    for mode, action in data.items():
+        pending_action = pending.setdefault(mode, {})
+        for key, value in action.items():
+            if key not in pending_action or mode in ("$set", "$unset"):
+                pending_action[key] = copy.deepcopy(value)
+
+            elif mode == "$inc":
+                pending_action[key] += value
+
+            elif mode == "$push":
+                items, modifiers = _split_push(pending_action[key])
+                items.extend(_split_push(value)[0])
+                pending_action[key] = {"$each": items, **modifiers}
+
+    return True
+
+
 async def update_db(db: AsyncIOMotorCollection, tempStore: dict, filter: dict, data: dict) -> bool:
+    """
+    Apply an update to the cached document and queue it for the database.
+
+    The write happens later through `DB_WRITER`, so the result is worked out from the cached
+    document instead: True if the update changed it, like `modified_count > 0` used to be.
+    An update that changes nothing is not queued at all.
+    """
+    changed = False
     for mode, action in data.items():
         for key, value in action.items():
             cursors = key.split(".")
@@ -265,75 +734,393 @@ async def update_db(db: AsyncIOMotorCollection, tempStore: dict, filter: dict, d
 
             if mode == "$set":
                 try:
+                    changed |= nested_data.get(cursors[-1], _MISSING) != value
                     nested_data[cursors[-1]] = value
-                except TypeError:
-                    nested_data[int(cursors[-1])] = value
+                except (AttributeError, TypeError):
+                    index = int(cursors[-1])
+                    changed |= index >= len(nested_data) or nested_data[index] != value
+                    nested_data[index] = value
 
             elif mode == "$unset":
-                nested_data.pop(cursors[-1], None)
+                changed |= nested_data.pop(cursors[-1], _MISSING) is not _MISSING
 
             elif mode == "$inc":
+                changed |= value != 0
                 nested_data[cursors[-1]] = nested_data.get(cursors[-1], 0) + value
 
             elif mode == "$push":
                 if isinstance(value, dict) and "$each" in value:
-                    nested_data.setdefault(cursors[-1], []).extend(
-                        value["$each"][value.get("$slice", len(value["$each"])) :]
-                    )
-                else:
-                    nested_data.setdefault(cursors[-1], []).extend([value])
-
-            elif mode == "$push":
-                if isinstance(value, dict) and "$each" in value:
-                    nested_data.setdefault(cursors[-1], []).extend(value["$each"])
-                    nested_data[cursors[-1]] = nested_data[cursors[-1]][value.get("$slice", len(value["$each"])) :]
+                    items = nested_data.setdefault(cursors[-1], [])
+                    before = list(items)
+                    items.extend(value["$each"])
+
+                    # Like MongoDB, $slice trims the stored array after the push, a negative one keeps the tail
+                    if (size := value.get("$slice")) is not None:
+                        items = nested_data[cursors[-1]] = items[size:] if size < 0 else items[:size]
+                    changed |= items != before
                 else:
+                    changed = True
                     nested_data.setdefault(cursors[-1], []).extend([value])
 
             elif mode == "$pull":
                 if cursors[-1] in nested_data:
                     value = value.get("$in", []) if isinstance(value, dict) else [value]
-                    nested_data[cursors[-1]] = [item for item in nested_data[cursors[-1]] if item not in value]
+                    items = nested_data[cursors[-1]]
+                    nested_data[cursors[-1]] = [item for item in items if item not in value]
+                    changed |= len(nested_data[cursors[-1]]) != len(items)
 
             else:
                 return False
 
-    result = await db.update_one(filter, data)
-    return result.modified_count > 0
+    if changed:
+        DB_WRITER.add(db, filter, data)
+    return changed
 
 
-async def get_settings(guild_id: int) -> dict[str, Any]:
-    settings = SETTINGS_BUFFER.get(guild_id)
-    if not settings:
-        settings = await SETTINGS_DB.find_one({"_id": guild_id})
-        if not settings:
-            await SETTINGS_DB.insert_one({"_id": guild_id})
+async def _load_document(db: AsyncIOMotorCollection, doc_id: int, default: dict[str, Any]) -> dict[str, Any]:
+    # Write out buffered updates first so the reloaded document is not stale
+    if DB_WRITER.is_pending(db, {"_id": doc_id}):
+        await DB_WRITER.flush()
+
+    document = await db.find_one({"_id": doc_id})
+    if not document:
+        document = {"_id": doc_id, **copy.deepcopy(default)}
+        await db.insert_one(document)
+
+    return document
 
-        settings = SETTINGS_BUFFER[guild_id] = settings or {}
-    return settings
+
+async def get_settings(guild_id: int) -> dict[str, Any]:
+    return await SETTINGS_CACHE.get_or_load(guild_id, lambda: _load_document(SETTINGS_DB, guild_id, {}))
 
 
 async def update_settings(guild_id: int, data: dict[str, dict[str, Any]]) -> bool:
     settings = await get_settings(guild_id)
-    return await update_db(SETTINGS_DB, settings, {"_id": guild_id}, data)
+    result = await update_db(SETTINGS_DB, settings, {"_id": guild_id}, data)
+    SETTINGS_CACHE.put(guild_id, settings)
+    return result
 
 
-async def get_user(user_id: int, d_type: str | None = None, need_copy: bool = True) -> dict[str, Any]:
-    user = USERS_BUFFER.get(user_id)
+async def _load_user(user_id: int, fields: set[str] | None) -> UserDocument:
+    if DB_WRITER.is_pending(USERS_DB, {"_id": user_id}):
+        await DB_WRITER.flush()
+
+    user = await USERS_DB.find_one({"_id": user_id}, dict.fromkeys(fields, 1) if fields else None)
     if not user:
-        user = await USERS_DB.find_one({"_id": user_id})
-        if not user:
-            user = {"_id": user_id, **USER_BASE}
-            await USERS_DB.insert_one(user)
+        user = {"_id": user_id, **copy.deepcopy(USER_BASE)}
+        await USERS_DB.insert_one(user)
+        return UserDocument(user)
 
-        USERS_BUFFER[user_id] = user
+    return UserDocument(user, set(fields) if fields else None)
+
+
+async def _fill_user(user: UserDocument, fields: set[str] | None) -> None:
+    if user.is_resident(fields):
+        return
+
+    if DB_WRITER.is_pending(USERS_DB, {"_id": user["_id"]}):
+        await DB_WRITER.flush()
+
+    missing = fields - user.resident if fields is not None else None
+    data = await USERS_DB.find_one({"_id": user["_id"]}, dict.fromkeys(missing, 1) if missing else None) or {}
+
+    # Fields already resident may hold updates that are newer than the database
+    for key, value in data.items():
+        if key not in user.resident:
+            user[key] = value
+
+    user.resident = user.resident | missing if missing is not None else None
+    USERS_CACHE.put(user["_id"], user, remeasure=True)
+
+
+async def _get_user_document(user_id: int, fields: set[str] | None = None) -> UserDocument:
+    """Return the cached user document with at least `fields` loaded, or all of it if `fields` is None."""
+    user = await USERS_CACHE.get_or_load(user_id, lambda: _load_user(user_id, fields))
+    if not user.is_resident(fields):
+        await USERS_CACHE.load_once((user_id, frozenset(fields or ())), lambda: _fill_user(user, fields))
+
+    return user
+
+
+async def get_user(user_id: int, d_type: str | None = None, need_copy: bool = True) -> dict[str, Any]:
+    user = await _get_user_document(user_id, {d_type} if d_type else None)
 
     if d_type:
         user = user.setdefault(d_type, copy.deepcopy(USER_BASE.get(d_type)))
 
-    return copy.deepcopy(user) if need_copy else user
+    return _cow(user) if need_copy else user
 
 
 async def update_user(user_id: int, data: dict) -> bool:
-    playlist = await get_user(user_id, need_copy=False)
-    return await update_db(USERS_DB, playlist, {"_id": user_id}, data)
+    user = await _get_user_document(user_id, {key.split(".")[0] for action in data.values() for key in action})
+    result = await update_db(USERS_DB, user, {"_id": user_id}, data)
+    USERS_CACHE.put(user_id, user)
+    return result
+
+
+def playlist_key(user_id: int, playlist_id: str) -> str:
+    return f"{user_id}-{playlist_id}"
+
+
+def playlist_size(playlist: dict[str, Any]) -> int:
+    """Return the number of tracks stored in a playlist, read from its page index."""
+    return sum(page["count"] for page in playlist.get("pages", []))
+
+
+def playlist_length(playlist: dict[str, Any]) -> int:
+    """Return the total duration in milliseconds of the tracks stored in a playlist."""
+    return sum(page["length"] for page in playlist.get("pages", []))
+
+
+def _track_lengths(track_ids: list[str]) -> list[int]:
+    lengths = []
+    for track_id in track_ids:
+        try:
+            lengths.append(decode(track_id).get("length", 0))
+        except Exception:
+            lengths.append(0)
+    return lengths
+
+
+def _paginate(track_ids: list[str]) -> tuple[list[list[str]], list[dict[str, int]]]:
+    lengths = _track_lengths(track_ids)
+    chunks, pages = [], []
+    for start in range(0, len(track_ids), PLAYLIST_PAGE_SIZE):
+        chunks.append(track_ids[start : start + PLAYLIST_PAGE_SIZE])
+        pages.append({"count": len(chunks[-1]), "length": sum(lengths[start : start + PLAYLIST_PAGE_SIZE])})
+    return chunks, pages
+
+
+async def _write_playlist_index(user_id: int, playlist_id: str, pages: list[dict[str, int]] | None) -> None:
+    """
+    Store a playlist's page index right after its pages were written, or remove the playlist if `pages` is None.
+
+    This bypasses `DB_WRITER` so the index reaches the database in the same path as the pages.
+    Buffered updates for the user are flushed first so none of them can land on top of it later.
+    """
+    user = await _get_user_document(user_id, {"playlist"})
+    if DB_WRITER.is_pending(USERS_DB, {"_id": user_id}):
+        await DB_WRITER.flush()
+
+    path = f"playlist.{playlist_id}"
+    if pages is None:
+        await USERS_DB.update_one({"_id": user_id}, {"$unset": {path: ""}})
+        user.get("playlist", {}).pop(playlist_id, None)
+    else:
+        await USERS_DB.update_one({"_id": user_id}, {"$set": {f"{path}.pages": pages}})
+        user.setdefault("playlist", {}).setdefault(playlist_id, {})["pages"] = pages
+
+    USERS_CACHE.put(user_id, user)
+
+
+async def _get_playlist(user_id: int, playlist_id: str) -> dict[str, Any]:
+    playlists = await get_user(user_id, "playlist", need_copy=False)
+    return playlists.get(playlist_id) or {}
+
+
+async def get_playlist_tracks(
+    user_id: int, playlist_id: str, start: int = 0, stop: int | None = None, raw: bool = False
+) -> list[str] | list[str | bytes]:
+    """
+    Return the track IDs in `[start, stop)` of a playlist, fetching only the pages that cover them.
+
+    With `raw` the IDs are returned as stored, which `voicelink.decode` accepts without a base64 round trip.
+    """
+    pages = (await _get_playlist(user_id, playlist_id)).get("pages", [])
+    total = sum(page["count"] for page in pages)
+    start, stop = max(start, 0), total if stop is None else min(stop, total)
+    if start >= stop:
+        return []
+
+    wanted, offset, first_offset = [], 0, None
+    for index, page in enumerate(pages):
+        if offset + page["count"] > start and offset < stop:
+            first_offset = offset if first_offset is None else first_offset
+            wanted.append(index)
+        offset += page["count"]
+
+    tracks = []
+    cursor = PLAYLISTS_DB.find(
+        {"playlist": playlist_key(user_id, playlist_id), "page": {"$in": wanted}},
+        {"tracks": 1},
+    ).sort("page", 1)
+    async for page in cursor:
+        tracks.extend(page["tracks"])
+
+    tracks = tracks[start - first_offset : stop - first_offset]
+    return tracks if raw else [unpack_track_id(track) for track in tracks]
+
+
+async def playlist_contains(user_id: int, playlist_id: str, track_id: str) -> bool:
+    key = playlist_key(user_id, playlist_id)
+    query = {"playlist": key, "tracks": {"$in": [track_id, pack_track_id(track_id)]}}
+    return await PLAYLISTS_DB.count_documents(query, limit=1) > 0
+
+
+async def add_playlist_tracks(user_id: int, playlist_id: str, track_ids: list[str]) -> bool:
+    """Append track IDs to a playlist, filling its last page before opening new ones."""
+    key = playlist_key(user_id, playlist_id)
+    async with PLAYLIST_LOCKS.setdefault(key, asyncio.Lock()):
+        pages = copy.deepcopy((await _get_playlist(user_id, playlist_id)).get("pages", []))
+        lengths = _track_lengths(track_ids)
+
+        operations, index = [], 0
+        while index < len(track_ids):
+            if not pages or pages[-1]["count"] >= PLAYLIST_PAGE_SIZE:
+                pages.append({"count": 0, "length": 0})
+
+            page, end = pages[-1], index + PLAYLIST_PAGE_SIZE - pages[-1]["count"]
+            chunk = [pack_track_id(track_id) for track_id in track_ids[index:end]]
+            if page["count"]:
+                # Rewrite the partially filled page so any base64 IDs left in it are converted too
+                data = await PLAYLISTS_DB.find_one({"playlist": key, "page": len(pages) - 1}) or {}
+                update = {"$set": {"tracks": [pack_track_id(track) for track in data.get("tracks", [])] + chunk}}
+            else:
+                update = {"$push": {"tracks": {"$each": chunk}}}
+
+            operations.append(UpdateOne({"playlist": key, "page": len(pages) - 1}, update, upsert=True))
+            page["count"] += len(chunk)
+            page["length"] += sum(lengths[index:end])
+            index = end
+
+        if not operations:
+            return False
+
+        await PLAYLISTS_DB.bulk_write(operations, ordered=True)
+        await _write_playlist_index(user_id, playlist_id, pages)
+        return True
+
+
+async def remove_playlist_track(user_id: int, playlist_id: str, position: int) -> str | None:
+    """Remove the track at `position` (0-based) and return its ID, rewriting only the page holding it."""
+    key = playlist_key(user_id, playlist_id)
+    async with PLAYLIST_LOCKS.setdefault(key, asyncio.Lock()):
+        pages = copy.deepcopy((await _get_playlist(user_id, playlist_id)).get("pages", []))
+
+        # Find the page holding the position and the number of tracks before it
+        index, offset = 0, 0
+        while index < len(pages) and position >= offset + pages[index]["count"]:
+            offset += pages[index]["count"]
+            index += 1
+
+        if index == len(pages):
+            return None
+
+        page = pages[index]
+        data = await PLAYLISTS_DB.find_one({"playlist": key, "page": index})
+        if not data:
+            return None
+
+        tracks = [pack_track_id(track) for track in data["tracks"]]
+        track_id = unpack_track_id(tracks.pop(position - offset))
+        await PLAYLISTS_DB.update_one({"_id": data["_id"]}, {"$set": {"tracks": tracks}})
+
+        page["count"] -= 1
+        page["length"] -= _track_lengths([track_id])[0]
+        await _write_playlist_index(user_id, playlist_id, pages)
+        return track_id
+
+
+async def clear_playlist_tracks(user_id: int, playlist_id: str) -> bool:
+    key = playlist_key(user_id, playlist_id)
+    async with PLAYLIST_LOCKS.setdefault(key, asyncio.Lock()):
+        result = await PLAYLISTS_DB.delete_many({"playlist": key})
+        await _write_playlist_index(user_id, playlist_id, [])
+        return result.deleted_count > 0
+
+
+async def delete_playlist(user_id: int, playlist_id: str) -> bool:
+    key = playlist_key(user_id, playlist_id)
+    async with PLAYLIST_LOCKS.setdefault(key, asyncio.Lock()):
+        await PLAYLISTS_DB.delete_many({"playlist": key})
+        await _write_playlist_index(user_id, playlist_id, None)
+        return True
+
+
+async def migrate_playlists() -> int:
+    """Move track lists still embedded in user documents into playlist pages. Returns the number of users migrated."""
+    await PLAYLISTS_DB.create_index([("playlist", 1), ("page", 1)], unique=True)
+
+    has_embedded_tracks = {
+        "$anyElementTrue": {
+            "$map": {
+                "input": {"$objectToArray": {"$ifNull": ["$playlist", {}]}},
+                "in": {"$ne": [{"$type": "$$this.v.tracks"}, "missing"]},
+            }
+        }
+    }
+
+    migrated = 0
+    async for user in USERS_DB.find({"$expr": has_embedded_tracks}, {"playlist": 1}):
+        update: dict[str, dict[str, Any]] = {"$set": {}, "$unset": {}}
+        for playlist_id, playlist in user["playlist"].items():
+            if "tracks" not in playlist:
+                continue
+
+            key = playlist_key(user["_id"], playlist_id)
+            chunks, pages = _paginate(playlist["tracks"])
+
+            # Start from a clean slate in case a previous run was interrupted
+            await PLAYLISTS_DB.delete_many({"playlist": key})
+            if chunks:
+                await PLAYLISTS_DB.insert_many(
+                    [
+                        {"playlist": key, "page": index, "tracks": [pack_track_id(track) for track in chunk]}
+                        for index, chunk in enumerate(chunks)
+                    ]
+                )
+
+            update["$set"][f"playlist.{playlist_id}.pages"] = pages
+            update["$unset"][f"playlist.{playlist_id}.tracks"] = ""
+
+        await USERS_DB.update_one({"_id": user["_id"]}, update)
+        USERS_CACHE.pop(user["_id"])
+        migrated += 1
+
+    return migrated
+
+
+async def repair_playlist_indexes() -> int:
+    """
+    Rebuild page indexes that no longer match the stored pages, e.g. after a crash between the two writes.
+
+    The track counts are derived from the pages themselves. Pages of playlists that no longer exist are removed.
+    Returns the number of playlists repaired.
+    """
+    counts = {
+        group["_id"]: group["count"]
+        async for group in PLAYLISTS_DB.aggregate(
+            [{"$group": {"_id": "$playlist", "count": {"$sum": {"$size": "$tracks"}}}}]
+        )
+    }
+
+    repaired = 0
+    async for user in USERS_DB.find({"playlist": {"$exists": True}}, {"playlist": 1}):
+        for playlist_id, playlist in (user.get("playlist") or {}).items():
+            if "pages" not in playlist:
+                continue
+
+            key = playlist_key(user["_id"], playlist_id)
+            if counts.pop(key, 0) == playlist_size(playlist):
+                continue
+
+            pages: list[dict[str, int]] = []
+            async for page in PLAYLISTS_DB.find({"playlist": key}).sort("page", 1):
+                pages.extend({"count": 0, "length": 0} for _ in range(page["page"] - len(pages)))
+                tracks = [unpack_track_id(track) for track in page["tracks"]]
+                pages.append({"count": len(tracks), "length": sum(_track_lengths(tracks))})
+
+            await USERS_DB.update_one({"_id": user["_id"]}, {"$set": {f"playlist.{playlist_id}.pages": pages}})
+            USERS_CACHE.pop(user["_id"])
+            repaired += 1
+
+    # Whatever is left belongs to playlists that were deleted before their pages were
+    if orphaned := list(counts):
+        await PLAYLISTS_DB.delete_many({"playlist": {"$in": orphaned}})
+
+    return repaired
+
+
+# voicelink imports this module (and the views that import from it) while it loads, so it is imported
+# last, once every name those modules need is defined
+from voicelink.transformer import decode, pack_track_id, unpack_track_id  # noqa: E402
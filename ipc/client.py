@@ -1,12 +1,35 @@
 import asyncio
 import logging
+from collections import OrderedDict
+from collections.abc import Hashable
+from itertools import count
 
 import aiohttp
 from discord.ext import commands
 
 import function as func
+from voicelink import get_codec
 
 from .methods import process_methods
+from .publisher import PlayerUpdatePublisher
+
+
+# Ops that only carry the latest state of a guild, a newer message makes the queued one obsolete
+COALESCED_OPS: set[str] = {
+    "playerUpdates",
+    "repeatTrack",
+    "toggleAutoplay",
+    "trackUpdate",
+    "updatePause",
+    "updatePosition",
+    "updateVolume",
+}
+
+# Ops that are dropped first when the outbound queue is full
+LOW_PRIORITY_OPS: set[str] = {"playerUpdates", "updatePosition"}
+
+# Sent in place of everything that was queued when the queue overflows with messages that cannot be shed
+RESYNC_MESSAGE: dict = {"op": "resync"}
 
 
 class IPCClient:
@@ -18,6 +41,8 @@ class IPCClient:
         password: str,
         heartbeat: int = 30,
         secure: bool = False,
+        player_update_interval: float = 1.0,
+        max_queue_size: int = 1000,
         *arg,
         **kwargs,
     ) -> None:
@@ -35,6 +60,14 @@ class IPCClient:
         self._session: aiohttp.ClientSession | None = None
         self._websocket: aiohttp.ClientWebSocketResponse | None = None
         self._task: asyncio.Task | None = None
+        self.publisher: PlayerUpdatePublisher = PlayerUpdatePublisher(self, interval=player_update_interval)
+
+        self.max_queue_size: int = max_queue_size
+        self.dropped: int = 0
+        self._queue: OrderedDict[Hashable, dict] = OrderedDict()
+        self._sequence = count()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._sender: asyncio.Task | None = None
 
         self._heanders = {
             "Authorization": self._password,
@@ -50,7 +83,7 @@ class IPCClient:
             except:
                 break
 
-            if msg.type in [aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED]:
+            if msg.type in [aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR]:
                 self._is_connected = False
                 self._logger.info("Connection closed. Trying to reconnect in 10s.")
                 await asyncio.sleep(10)
@@ -60,46 +93,80 @@ class IPCClient:
                         await self.connect()
                     except Exception:
                         self._logger.error("Reconnection failed.")
-            else:
-                self._bot.loop.create_task(process_methods(self, self._bot, msg.json()))
 
-    async def send(self, data: dict) -> None:
-        if self.is_connected:
-            try:
-                await self._websocket.send_json(data)
-                self._logger.debug(f"Send Message: {data}")
-            except ConnectionResetError as _:
-                await self.disconnect()
-                await self.connect()
-                await self._websocket.send_json(data)
-                self._logger.debug(f"Send Message: {data}")
+                # A successful connect runs its own listener on the new websocket
+                if self._is_connected:
+                    return
+            else:
+                self._bot.loop.create_task(process_methods(self, self._bot, get_codec().loads(msg.data)))
 
     async def send(self, data: dict) -> None:
-        # Check if the websocket is still open
-        if self.is_connected:
-            try:
-                await self._websocket.send_json(data)
-                self._logger.debug(f"Sent Message: {data}")
-            except ConnectionResetError:
-                self._logger.warning("Connection lost, attempting to reconnect.")
-                await self._handle_reconnect(data)
-            except Exception as e:
-                self._logger.error(f"Failed to send message: {e}")
+        """
+        Queue a message for the dashboard and return right away, the sender task delivers it.
+
+        Messages are kept while reconnecting, a newer state message replaces a queued one for the same guild.
+        """
+        if not self._session:
+            return
+
+        op = data.get("op")
+        if op in COALESCED_OPS:
+            key = (op, data.get("guildId"))
+            if op == "playerUpdates" and (queued := self._queue.get(key)):
+                # Keep the updates of guilds the newer frame does not mention
+                players = {player["guildId"]: player for player in queued["players"]}
+                players.update((player["guildId"], player) for player in data["players"])
+                data = {**data, "players": list(players.values())}
+
+            self._queue.pop(key, None)
         else:
-            self._logger.warning("WebSocket is not connected or already closed.")
-
-    async def _handle_reconnect(self, data: dict) -> None:
-        await self.disconnect()
-        await self.connect()
-        await asyncio.sleep(1)  # Optional delay before retrying
-        if self.is_connected:
-            try:
-                await self._websocket.send_json(data)
-                self._logger.debug(f"Sent Message on reconnect: {data}")
-            except Exception as e:
-                self._logger.error(f"Failed to send message on reconnect: {e}")
-        else:
-            self._logger.error("Reconnection failed, not connected.")
+            key = next(self._sequence)
+
+        self._queue[key] = data
+        if len(self._queue) > self.max_queue_size:
+            self._shed()
+
+        self._wakeup.set()
+
+    def _shed(self) -> None:
+        # Only state messages are shed one by one, the dashboard just misses intermediate states
+        for ops in (LOW_PRIORITY_OPS, COALESCED_OPS):
+            victim = next((key for key, data in self._queue.items() if data.get("op") in ops), None)
+            if victim is not None:
+                data = self._queue.pop(victim)
+                self.dropped += 1
+                self._logger.warning(
+                    f"Outbound queue is full, dropped a {data.get('op')} message ({self.dropped} so far)."
+                )
+                return
+
+        # Dropping any other message would leave a gap the dashboard cannot detect, so drop them all and tell it
+        self.dropped += len(self._queue)
+        self._queue.clear()
+        self._queue["resync"] = dict(RESYNC_MESSAGE)
+        self._logger.warning(f"Outbound queue is full, dropped all queued messages ({self.dropped} so far).")
+
+    async def _send_queued(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._queue and self.is_connected:
+                key, data = self._queue.popitem(last=False)
+                try:
+                    await self._websocket.send_json(data, dumps=get_codec().dumps)
+                    self._logger.debug(f"Sent Message: {data}")
+                except Exception as e:
+                    # Put it back in front unless a newer state already replaced it,
+                    # the listener takes care of reconnecting
+                    if key not in self._queue:
+                        self._queue[key] = data
+                        self._queue.move_to_end(key, last=False)
+
+                    self._logger.warning(f"Failed to send message, keeping it until the dashboard is back: {e}")
+                    self._is_connected = False
+                    await self._websocket.close()
+                    break
 
     async def connect(self):
         try:
@@ -116,6 +183,11 @@ class IPCClient:
 
             self._task = self._bot.loop.create_task(self._listen())
             self._is_connected = True
+            self.publisher.start()
+
+            if self._sender is None or self._sender.done():
+                self._sender = self._bot.loop.create_task(self._send_queued())
+            self._wakeup.set()
 
             self._logger.info("Connected to dashboard!")
 
@@ -135,7 +207,12 @@ class IPCClient:
 
     async def disconnect(self) -> None:
         self._is_connected = False
-        self._task.cancel()
+        if self._task:
+            self._task.cancel()
+        if self._sender:
+            self._sender.cancel()
+            self._sender = None
+        self.publisher.stop()
         self._logger.info("Disconnected to dashboard!")
 
     @property
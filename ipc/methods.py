@@ -1,12 +1,13 @@
 import re
 import time
+from itertools import chain
 
 from discord import Member, User
 from discord.ext import commands
 
 import function as func
 from addons import LYRICS_PLATFORMS
-from voicelink import Filters, LoopType, NodePool, Player, Playlist, Track, decode
+from voicelink import Filters, LoopType, NodePool, Player, Playlist, Track, decode, decode_many
 
 
 RATELIMIT_COUNTER: dict[int, dict[str, float]] = {}
@@ -101,6 +102,12 @@ async def initBot(bot: commands.Bot, data: dict) -> dict:
 async def initUser(bot: commands.Bot, data: dict) -> dict:
     user_id = int(data.get("userId"))
     data = await func.get_user(user_id)
+    data["history"] = [func.unpack_track_id(track_id) for track_id in data.get("history", [])]
+
+    # Playlist tracks are stored in pages, but the dashboard still expects each playlist to carry its track list
+    for playlist_id, playlist in data.get("playlist", {}).items():
+        if playlist.pop("pages", None) is not None:
+            playlist["tracks"] = await func.get_playlist_tracks(user_id, playlist_id)
 
     for mail in data.get("inbox"):
         sender = bot.get_user(mail.get("sender"))
@@ -139,7 +146,8 @@ async def initPlayer(player: Player, member: Member, data: dict) -> dict:
             for member in player.channel.members
         ],
         "tracks": [
-            {"trackId": track.track_id, "requesterId": str(track.requester.id)} for track in player.queue._queue
+            {"trackId": track.track_id, "requesterId": str(track.requester.id)}
+            for track in chain(player.queue._history, player.queue._upcoming)
         ],
         "repeatMode": player.queue.repeat.lower(),
         "channelName": player.channel.name,
@@ -164,6 +172,7 @@ async def closeConnection(bot: commands.Bot, data: dict) -> None:
     player: Player = guild.voice_client
     if player:
         player._ipc_connection = False
+        bot.ipc.publisher.forget(guild_id)
 
 
 async def getRecommendation(bot: commands.Bot, data: dict) -> None:
@@ -247,7 +256,11 @@ async def moveTrack(player: Player, member: Member, data: dict) -> None:
 
 async def addTracks(player: Player, member: Member, data: dict) -> None:
     _type = data.get("type", "addToQueue")
-    tracks = [Track(track_id=track_id, info=decode(track_id), requester=member) for track_id in data.get("tracks", [])]
+    track_ids = data.get("tracks", [])
+    tracks = [
+        Track(track_id=track_id, info=info, requester=member)
+        for track_id, info in zip(track_ids, decode_many(track_ids), strict=True)
+    ]
 
     if _type == "addToQueue":
         await player.add_track(tracks)
@@ -376,7 +389,7 @@ async def toggleAutoplay(player: Player, member: Member, data: dict) -> dict:
     return {
         "op": "toggleAutoplay",
         "status": check,
-        "guildId": player.guild.id,
+        "guildId": str(player.guild.id),
         "requesterId": str(member.id),
     }
 
@@ -406,13 +419,15 @@ async def updateFilter(player: Player, member: Member, data: dict) -> None:
         await player.reset_filter(requester=member)
 
 
-async def _loadPlaylist(playlist: dict) -> list[Track] | None:
+async def _loadPlaylist(
+    user_id: int, playlist_id: str, playlist: dict, start: int = 0, stop: int | None = None
+) -> list[str] | None:
     if playlist.get("type") == "link":
         tracks: list[Track] = await NodePool.get_node().get_tracks(playlist.get("uri"), requester=None)
         if tracks:
-            return [track.track_id for track in (tracks.tracks if isinstance(tracks, Playlist) else tracks)]
+            return [track.track_id for track in (tracks.tracks if isinstance(tracks, Playlist) else tracks)][start:stop]
     else:
-        return playlist.get("tracks", [])
+        return await func.get_playlist_tracks(user_id, playlist_id, start, stop)
     return None
 
 
@@ -423,7 +438,7 @@ def _assign_playlist_id(existed: list) -> str:
     return None
 
 
-async def _getPlaylist(user_id: int, playlist_id: str) -> dict:
+async def _getPlaylist(user_id: int, playlist_id: str, start: int = 0, stop: int | None = None) -> dict:
     playlists = await func.get_user(user_id, "playlist")
     playlist = playlists.get(playlist_id)
     if not playlist:
@@ -433,9 +448,13 @@ async def _getPlaylist(user_id: int, playlist_id: str) -> dict:
         target_user = await func.get_user(playlist["user"], "playlist")
         target_playlist = target_user.get(playlist["referId"])
         if target_playlist and user_id in target_playlist.get("perms", {}).get("read", []):
-            playlist["tracks"] = await _loadPlaylist(target_playlist)
+            playlist["total"] = func.playlist_size(target_playlist)
+            playlist["tracks"] = await _loadPlaylist(
+                playlist["user"], playlist["referId"], target_playlist, start, stop
+            )
     else:
-        playlist["tracks"] = await _loadPlaylist(playlist)
+        playlist["total"] = func.playlist_size(playlist)
+        playlist["tracks"] = await _loadPlaylist(user_id, playlist_id, playlist, start, stop)
 
     return playlist
 
@@ -444,9 +463,14 @@ async def getPlaylist(bot: commands.Bot, data: dict) -> dict:
     user_id = int(data.get("userId"))
     playlist_id = str(data.get("playlistId"))
 
+    # The dashboard may ask for a window of the playlist instead of the whole track list
+    start = int(data.get("offset", 0))
+    stop = start + int(limit) if (limit := data.get("limit")) else None
+
     payload = {"op": "loadPlaylist", "playlistId": playlist_id, "userId": str(user_id)}
-    playlist = await _getPlaylist(user_id, playlist_id)
-    payload["tracks"] = playlist["tracks"] if playlist else []
+    playlist = await _getPlaylist(user_id, playlist_id, start, stop)
+    payload["tracks"] = (playlist.get("tracks") or []) if playlist else []
+    payload["total"] = playlist.get("total", len(payload["tracks"])) if playlist else 0
 
     return payload
 
@@ -511,7 +535,7 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
             {"uri": playlist_url, "perms": {"read": []}, "name": name, "type": "link"}
             if playlist_url
             else {
-                "tracks": [],
+                "pages": [],
                 "perms": {"read": [], "write": [], "remove": []},
                 "name": name,
                 "type": "playlist",
@@ -524,11 +548,11 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
             "playlistId": assigned_playlist_id,
             "msg": f"You have created '{name}' playlist.",
             "userId": str(user_id),
-            "data": data,
+            "data": {**data, "tracks": []} if not playlist_url else data,
         }
 
     if _type == "removePlaylist":
-        playlist = await _getPlaylist(user_id, playlist_id)
+        playlist = (await func.get_user(user_id, "playlist")).get(playlist_id)
         if playlist:
             if playlist["type"] == "share":
                 await func.update_user(
@@ -536,7 +560,7 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
                     {"$pull": {f"playlist.{playlist['referId']}.perms.read": user_id}},
                 )
 
-            await func.update_user(user_id, {"$unset": {f"playlist.{playlist_id}": 1}})
+            await func.delete_playlist(user_id, playlist_id)
 
         return {
             "op": "updatePlaylist",
@@ -584,7 +608,10 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
         if not track_id:
             return error_msg("No track ID could be located.", user_id=user_id, level="error")
 
-        playlist = await _getPlaylist(user_id, playlist_id)
+        playlist = (await func.get_user(user_id, "playlist")).get(playlist_id)
+        if not playlist:
+            return error_msg("Playlist not found!", user_id=user_id, level="error")
+
         if playlist["type"] in ["share", "link"]:
             return error_msg(
                 "You cannot add songs to a linked playlist through Vocard.",
@@ -593,7 +620,7 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
             )
 
         rank, max_p, max_t = func.check_roles()
-        if len(playlist["tracks"]) >= max_t:
+        if func.playlist_size(playlist) >= max_t:
             return error_msg(
                 f"You have reached the limit! You can only add {max_t} songs to your playlist.",
                 user_id=user_id,
@@ -606,7 +633,7 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
                 user_id=user_id,
             )
 
-        await func.update_user(user_id, {"$push": {f"playlist.{playlist_id}.tracks": track_id}})
+        await func.add_playlist_tracks(user_id, playlist_id, [track_id])
         return {
             "op": "updatePlaylist",
             "status": "addTrack",
@@ -621,7 +648,7 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
         if not track_id:
             return error_msg("No track ID could be located.", user_id=user_id, level="error")
 
-        playlist = await _getPlaylist(user_id, playlist_id)
+        playlist = (await func.get_user(user_id, "playlist")).get(playlist_id)
         if not playlist:
             return error_msg("Playlist not found!", user_id=user_id, level="error")
 
@@ -632,26 +659,23 @@ async def updatePlaylist(bot: commands.Bot, data: dict) -> dict:
                 level="error",
             )
 
-        if not 0 <= track_position < len(playlist["tracks"]):
+        if not 0 <= track_position < func.playlist_size(playlist):
             return error_msg(
                 "Cannot find the position from your playlist.",
                 user_id=user_id,
                 level="error",
             )
 
-        if playlist["tracks"][track_position] != track_id:
+        if await func.get_playlist_tracks(user_id, playlist_id, track_position, track_position + 1) != [track_id]:
             return error_msg(
                 "Something wrong while removing the track from your playlist.",
                 user_id=user_id,
                 level="error",
             )
 
-        await func.update_user(
-            user_id,
-            {"$pull": {f"playlist.{playlist_id}.tracks": playlist["tracks"][track_position]}},
-        )
+        await func.remove_playlist_track(user_id, playlist_id, track_position)
 
-        decoded_track = decode(playlist["tracks"][track_position])
+        decoded_track = decode(track_id)
         return {
             "op": "updatePlaylist",
             "status": "removeTrack",
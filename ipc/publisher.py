@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from voicelink import Player
+
+    from .client import IPCClient
+
+
+class PlayerUpdatePublisher:
+    """
+    Collects player state updates and publishes them to the dashboard once per tick.
+
+    Players only mark themselves as changed, so handling a Lavalink playerUpdate never waits on the dashboard.
+    Each tick sends a single playerUpdates frame holding the watched guilds whose state actually changed.
+    """
+
+    def __init__(self, client: "IPCClient", *, interval: float = 1.0) -> None:
+        self._client: IPCClient = client
+        self.interval: float = interval
+
+        self._pending: dict[int, Player] = {}
+        self._published: dict[int, tuple[int, bool]] = {}
+        self._task: asyncio.Task | None = None
+        self._logger: logging.Logger = logging.getLogger("ipc_client")
+
+    def mark(self, player: "Player") -> None:
+        """Flag the player's state as changed, to be published on the next tick."""
+        self._pending[player.guild.id] = player
+
+    def forget(self, guild_id: int) -> None:
+        """Drop everything kept for the guild, so its next state is published in full."""
+        self._pending.pop(guild_id, None)
+        self._published.pop(guild_id, None)
+
+    def start(self) -> None:
+        """Start publishing once per `interval` if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop publishing and forget every pending and published state."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
+        self._published.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._pending:
+                continue
+
+            pending, self._pending = self._pending, {}
+            try:
+                await self.publish(pending.values())
+            except Exception as e:
+                self._logger.error("Error occurred while publishing player updates.", exc_info=e)
+
+    async def publish(self, players: "Iterable[Player]") -> None:
+        """Send the state of the given players that changed since it was last published."""
+        updates = []
+        for player in players:
+            guild_id = player.guild.id
+            if not player.is_ipc_connected:
+                self._published.pop(guild_id, None)
+                continue
+
+            # A paused player keeps reporting the same position, the dashboard already has it
+            state = (player._last_position, player._is_connected)
+            if self._published.get(guild_id) == state:
+                continue
+
+            self._published[guild_id] = state
+            updates.append(
+                {
+                    "guildId": str(guild_id),
+                    "lastUpdate": player._last_update,
+                    "isConnected": player._is_connected,
+                    "lastPosition": player._last_position,
+                }
+            )
+
+        if updates:
+            await self._client.send({"op": "playerUpdates", "players": updates})
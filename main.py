@@ -73,6 +73,14 @@ class Vocard(commands.Bot):
 
         self.ipc: IPCClient
 
+    async def close(self) -> None:
+        """Close the bot, then write out the updates still buffered for the database."""
+        # Unloading the cogs and tearing down players still writes to the database, flush the buffer after that
+        await super().close()
+
+        if writer := getattr(func, "DB_WRITER", None):
+            await writer.close()
+
     async def on_message(self, message: discord.Message, /) -> None:
         # Ignore messages from bots or DMs
         if message.author.bot or not message.guild:
@@ -123,6 +131,18 @@ class Vocard(commands.Bot):
 
         func.SETTINGS_DB = func.MONGO_DB[db_name]["Settings"]
         func.USERS_DB = func.MONGO_DB[db_name]["Users"]
+        func.PLAYLISTS_DB = func.MONGO_DB[db_name]["Playlists"]
+
+        func.DB_WRITER = func.WriteBehindBuffer(**func.settings.db_write_buffer)
+        func.SETTINGS_CACHE = func.Cache(**func.settings.cache.get("settings", {}))
+        func.USERS_CACHE = func.Cache(**func.settings.cache.get("users", {}))
+        func.DB_WRITER.start()
+
+        if migrated := await func.migrate_playlists():
+            func.logger.info(f"Moved the playlist tracks of {migrated} user(s) into the Playlists collection.")
+
+        if repaired := await func.repair_playlist_indexes():
+            func.logger.warning(f"Rebuilt the page index of {repaired} playlist(s) that no longer matched their pages.")
 
     async def setup_hook(self) -> None:
         func.langs_setup()
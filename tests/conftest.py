@@ -0,0 +1,25 @@
+import atexit
+import json
+import os
+import sys
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTINGS_PATH = os.path.join(ROOT_DIR, "settings.json")
+
+sys.path.insert(0, ROOT_DIR)
+
+# function.py refuses to import without a settings file, fall back to the example one for the test run
+if not os.path.exists(SETTINGS_PATH):
+    with open(os.path.join(ROOT_DIR, "settings Example.json"), encoding="utf8") as f:
+        example = json.load(f)
+
+    with open(SETTINGS_PATH, "w", encoding="utf8") as f:
+        json.dump({**example, "client_id": 0}, f)
+    atexit.register(os.remove, SETTINGS_PATH)
+
+import function as func  # noqa: E402
+from addons import Settings  # noqa: E402
+
+
+func.settings = Settings(func.open_json("settings.json"))
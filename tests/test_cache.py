@@ -0,0 +1,85 @@
+import asyncio
+
+import function
+from function import Cache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = Cache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_entries_are_evicted_to_stay_under_max_bytes():
+    cache = Cache(max_bytes=1)
+    cache.put("a", "x" * 100)
+    cache.put("b", "y" * 100)
+
+    # The newest entry is kept even when it alone exceeds the budget
+    assert "a" not in cache and cache.get("b") == "y" * 100
+
+
+def test_entries_expire_and_reads_refresh_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(function, "monotonic", clock)
+    cache = Cache(ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    clock.now = 8
+    assert cache.get("a") == 1
+
+    clock.now = 15
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.peek("b") is None and cache.expirations == 1
+
+    cache.put("c", 3)
+    clock.now = 30
+    assert cache.peek("c") is None
+    assert cache.peek("c", allow_expired=True) == 3
+    assert cache.purge() == 2
+
+
+def test_concurrent_loads_of_the_same_key_share_one_call():
+    cache, calls = Cache(), []
+
+    async def loader() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"loaded": True}
+
+    async def run() -> list[dict]:
+        return await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"loaded": True} for result in results)
+    assert cache.get("a") == {"loaded": True}
+
+
+def test_writing_back_a_document_keeps_its_size_estimate():
+    cache, document = Cache(), {"history": []}
+    cache.put("a", document)
+    size = cache.bytes
+
+    document["history"].extend(range(100))
+    cache.put("a", document)
+    assert cache.bytes == size
+
+    cache.put("a", document, remeasure=True)
+    assert cache.bytes > size
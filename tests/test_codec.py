@@ -0,0 +1,30 @@
+import pytest
+
+from voicelink import codec
+from voicelink.codec import JSONCodec, StdlibCodec, get_codec, set_codec
+
+
+def test_base_codec_cannot_be_created():
+    with pytest.raises(TypeError):
+        JSONCodec()
+
+
+def test_set_codec_by_name_swaps_the_codec_in_use():
+    previous = get_codec()
+    try:
+        assert isinstance(set_codec("json"), StdlibCodec)
+        assert get_codec().loads(b'{"op":"ready"}') == {"op": "ready"}
+        assert get_codec().dumpb({"op": "ready"}) == b'{"op":"ready"}'
+    finally:
+        set_codec(previous)
+
+
+def test_set_codec_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        set_codec("yaml")
+
+
+@pytest.mark.skipif(codec.orjson is not None, reason="orjson is installed")
+def test_orjson_codec_needs_the_speed_extra():
+    with pytest.raises(ImportError, match="speed"):
+        codec.OrjsonCodec()
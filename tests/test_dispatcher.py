@@ -0,0 +1,76 @@
+import asyncio
+
+from voicelink.utils import EventDispatcher
+
+
+def test_payloads_for_a_key_are_handled_in_order():
+    handled: list[tuple[str, int]] = []
+
+    async def handler(payload: tuple[str, int]) -> None:
+        await asyncio.sleep(0.001 * (payload[1] % 3))
+        handled.append(payload)
+
+    async def run() -> EventDispatcher:
+        dispatcher = EventDispatcher(handler, workers=4, batch_size=2)
+        for index in range(10):
+            for key in ("a", "b", "c"):
+                dispatcher.put(key, (key, index))
+
+        dispatcher.start()
+        while dispatcher.depth or dispatcher.mailboxes:
+            await asyncio.sleep(0.01)
+        dispatcher.stop()
+        return dispatcher
+
+    dispatcher = asyncio.run(run())
+    for key in ("a", "b", "c"):
+        assert [index for handled_key, index in handled if handled_key == key] == list(range(10))
+    assert dispatcher.processed == 30
+
+
+def test_a_slow_key_does_not_block_the_others():
+    release, handled = None, []
+
+    async def handler(payload: str) -> None:
+        if payload == "slow":
+            await release.wait()
+        handled.append(payload)
+
+    async def run() -> None:
+        nonlocal release
+        release = asyncio.Event()
+        dispatcher = EventDispatcher(handler, workers=2)
+        dispatcher.put("a", "slow")
+        dispatcher.put("a", "after slow")
+        dispatcher.put("b", "fast")
+        dispatcher.start()
+
+        await asyncio.sleep(0.01)
+        assert handled == ["fast"]
+
+        release.set()
+        await asyncio.sleep(0.01)
+        dispatcher.stop()
+
+    asyncio.run(run())
+    assert handled == ["fast", "slow", "after slow"]
+
+
+def test_handler_errors_do_not_stop_the_worker():
+    handled = []
+
+    async def handler(payload: int) -> None:
+        if payload == 0:
+            raise RuntimeError
+        handled.append(payload)
+
+    async def run() -> None:
+        dispatcher = EventDispatcher(handler, workers=1)
+        for payload in range(3):
+            dispatcher.put("a", payload)
+        dispatcher.start()
+        await asyncio.sleep(0.01)
+        dispatcher.stop()
+
+    asyncio.run(run())
+    assert handled == [1, 2]
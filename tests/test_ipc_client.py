@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+from ipc.client import IPCClient, RESYNC_MESSAGE
+
+
+def build_client(max_queue_size: int = 1000) -> IPCClient:
+    bot = SimpleNamespace(user=SimpleNamespace(id=1), loop=None)
+    client = IPCClient(bot, host="localhost", port=8000, password="", max_queue_size=max_queue_size)
+    client._session = object()  # send() only queues while a session exists
+    return client
+
+
+def send(client: IPCClient, *messages: dict) -> None:
+    async def run() -> None:
+        for message in messages:
+            await client.send(message)
+
+    asyncio.run(run())
+
+
+def test_state_messages_replace_the_queued_one_for_the_same_guild():
+    client = build_client()
+    send(
+        client,
+        {"op": "updateVolume", "guildId": "1", "volume": 10},
+        {"op": "addTracks", "guildId": "1"},
+        {"op": "updateVolume", "guildId": "2", "volume": 20},
+        {"op": "updateVolume", "guildId": "1", "volume": 30},
+    )
+
+    assert list(client._queue.values()) == [
+        {"op": "addTracks", "guildId": "1"},
+        {"op": "updateVolume", "guildId": "2", "volume": 20},
+        {"op": "updateVolume", "guildId": "1", "volume": 30},
+    ]
+
+
+def test_player_update_frames_are_merged():
+    client = build_client()
+    send(
+        client,
+        {"op": "playerUpdates", "players": [{"guildId": "1", "position": 1}, {"guildId": "2", "position": 1}]},
+        {"op": "playerUpdates", "players": [{"guildId": "1", "position": 2}]},
+    )
+
+    assert list(client._queue.values()) == [
+        {"op": "playerUpdates", "players": [{"guildId": "1", "position": 2}, {"guildId": "2", "position": 1}]}
+    ]
+
+
+def test_full_queue_sheds_low_priority_then_state_messages():
+    client = build_client(max_queue_size=3)
+    send(
+        client,
+        {"op": "addTracks", "guildId": "1"},
+        {"op": "updateVolume", "guildId": "1", "volume": 10},
+        {"op": "updatePosition", "guildId": "1", "position": 1},
+        {"op": "addTracks", "guildId": "2"},
+    )
+    assert [data["op"] for data in client._queue.values()] == ["addTracks", "updateVolume", "addTracks"]
+
+    send(client, {"op": "addTracks", "guildId": "3"})
+    assert [data["op"] for data in client._queue.values()] == ["addTracks", "addTracks", "addTracks"]
+    assert client.dropped == 2
+
+
+def test_full_queue_without_state_messages_is_replaced_by_a_resync():
+    client = build_client(max_queue_size=2)
+    send(client, *({"op": "addTracks", "guildId": str(guild_id)} for guild_id in range(3)))
+
+    assert list(client._queue.values()) == [RESYNC_MESSAGE]
+    assert client.dropped == 3
+
+
+def test_disconnect_cancels_the_sender():
+    client = build_client()
+
+    async def run() -> asyncio.Task:
+        client._sender = sender = asyncio.create_task(client._send_queued())
+        await client.disconnect()
+        await asyncio.sleep(0)
+        return sender
+
+    assert asyncio.run(run()).cancelled()
+    assert client._sender is None
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from voicelink import Player
+from voicelink.enums import RequestMethod
+from voicelink.exceptions import NodeConnectionFailure
+from voicelink.pool import Node, NodePool, NodeRebalancer
+from voicelink.utils import NodeStats
+
+
+class Websocket:
+    closed = False
+
+
+class Guild:
+    id = 1009021219011395634
+    name = "Test"
+
+
+def build_node(identifier: str, players: int) -> Node:
+    node = Node.__new__(Node)
+    node._identifier = identifier
+    node._session_id = f"{identifier}-session"
+    node._available = True
+    node._websocket = Websocket()
+    node._players = {}
+    node._players_moved_away = 0
+    node._resumed_players = {}
+    node._stats = NodeStats(
+        {
+            "memory": {"used": 0, "free": 1, "reservable": 1, "allocated": 1},
+            "cpu": {"cores": 1, "systemLoad": 0, "lavalinkLoad": 0},
+            "playingPlayers": players,
+            "players": players,
+        }
+    )
+    node.requests = []
+
+    async def send(method: RequestMethod, query: str, data: dict | None = None) -> None:
+        node.requests.append((method, query))
+
+    node.send = send
+    return node
+
+
+def build_player(node: Node) -> Player:
+    # Only the attributes change_node touches, a real player needs a bot and a voice channel
+    player = Player.__new__(Player)
+    player._guild = Guild()
+    player._node = node
+    player._logger = logging.getLogger("voicelink")
+    player._voice_state = {}
+    player._current = None
+    player._is_connected = True
+    player._paused = False
+    player._pending_node = None
+    node._players[player.guild.id] = player
+    return player
+
+
+def test_change_node_destroys_the_player_on_the_source_node(monkeypatch):
+    source, target = build_node("source", players=2), build_node("target", players=0)
+    monkeypatch.setattr(NodePool, "_nodes", {"source": source, "target": target})
+    player = build_player(source)
+    penalty = source.penalty
+
+    asyncio.run(player.change_node("target"))
+
+    assert source.requests == [(RequestMethod.DELETE, f"sessions/source-session/players/{Guild.id}")]
+    assert player._node is target and Guild.id in target.players
+    assert source.player_count == 0
+    assert source.penalty == penalty - 1
+
+
+def test_change_node_skips_an_unavailable_source_node(monkeypatch):
+    source, target = build_node("source", players=1), build_node("target", players=0)
+    monkeypatch.setattr(NodePool, "_nodes", {"source": source, "target": target})
+    player = build_player(source)
+    source._available = False
+
+    asyncio.run(player.change_node("target"))
+
+    assert source.requests == []
+    assert player._node is target
+
+
+def test_rebalancer_moves_idle_players_off_the_hot_node(monkeypatch):
+    source, target = build_node("source", players=3), build_node("target", players=0)
+    monkeypatch.setattr(NodePool, "_nodes", {"source": source, "target": target})
+    player = build_player(source)
+    penalty = source.penalty
+
+    rebalancer = NodeRebalancer(max_moves=1, hot_penalty=2, cool_penalty=1, margin=0)
+    assert asyncio.run(rebalancer.rebalance()) == 1
+
+    assert player._node is target
+    assert source.requests == [(RequestMethod.DELETE, f"sessions/source-session/players/{Guild.id}")]
+    assert source.player_count == 0
+    assert source.penalty < penalty
+
+
+def test_get_resumed_node_prefers_the_node_holding_the_guild(monkeypatch):
+    busy, idle = build_node("busy", players=5), build_node("idle", players=0)
+    monkeypatch.setattr(NodePool, "_nodes", {"busy": busy, "idle": idle})
+    busy._resumed_players[Guild.id] = {"guildId": str(Guild.id)}
+
+    assert NodePool.get_resumed_node(Guild.id) is busy
+    assert NodePool.get_resumed_node(1) is None
+
+    busy._available = False
+    assert NodePool.get_resumed_node(Guild.id) is None
+
+
+class SilentWebsocket:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def receive(self) -> None:
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class Session:
+    def __init__(self) -> None:
+        self.websocket = SilentWebsocket()
+
+    async def ws_connect(self, *args, **kwargs) -> SilentWebsocket:
+        return self.websocket
+
+
+def test_connect_cleans_up_when_the_node_never_gets_ready(monkeypatch):
+    async def wait_for(awaitable, timeout: float) -> None:
+        awaitable.close()
+        raise TimeoutError
+
+    async def run() -> Node:
+        bot = SimpleNamespace(
+            user=SimpleNamespace(id=1), loop=asyncio.get_running_loop(), add_listener=lambda *args: None
+        )
+        session = Session()
+        node = Node(
+            pool=NodePool, bot=bot, host="localhost", port=2333, password="", identifier="silent", session=session
+        )
+        monkeypatch.setattr(asyncio, "wait_for", wait_for)
+
+        with pytest.raises(NodeConnectionFailure) as error:
+            await node.connect()
+        await asyncio.sleep(0)
+
+        assert isinstance(error.value.__cause__, TimeoutError)
+        assert session.websocket.closed
+        assert node._task.cancelled()
+        assert not node._dispatcher._tasks
+        return node
+
+    node = asyncio.run(run())
+    assert not node._available
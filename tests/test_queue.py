@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+
+from voicelink.exceptions import OutofList, QueueFull
+from voicelink.queue import FairQueue
+
+
+def build_queue(size: int = 100) -> FairQueue:
+    return FairQueue(size, True, lambda key: key)
+
+
+def track(requester: str, title: str) -> SimpleNamespace:
+    return SimpleNamespace(requester=requester, title=title)
+
+
+def titles(queue: FairQueue) -> list[str]:
+    return [track.title for track in queue.tracks()]
+
+
+def test_requesters_take_turns():
+    queue = build_queue()
+    for item in (track("a", "a1"), track("a", "a2"), track("a", "a3"), track("b", "b1"), track("c", "c1")):
+        queue.put(item)
+
+    assert titles(queue) == ["a1", "b1", "c1", "a2", "a3"]
+
+
+def test_current_track_counts_as_a_turn():
+    queue = build_queue()
+    queue.put_many([track("a", "a1"), track("a", "a2"), track("b", "b1")])
+    assert queue.get().title == "a1"
+
+    queue.put(track("b", "b2"))
+    queue.put(track("a", "a3"))
+    assert titles(queue) == ["b1", "a2", "b2", "a3"]
+
+
+def test_reordering_rebuilds_the_requester_index():
+    queue = build_queue()
+    queue.put_many([track("a", "a1"), track("b", "b1"), track("a", "a2")])
+
+    # Moving past the end of the queue places the track last
+    queue.move(1, 10)
+    assert titles(queue) == ["b1", "a2", "a1"]
+
+    queue.put(track("b", "b2"))
+    assert titles(queue) == ["b1", "a2", "b2", "a1"]
+
+
+def test_put_many_stops_at_capacity():
+    queue = build_queue(size=3)
+    added = queue.put_many([track("a", "a1"), track("a", "a2"), track("b", "b1"), track("b", "b2")])
+
+    assert [item.title for item in added] == ["a1", "a2", "b1"]
+    assert titles(queue) == ["a1", "b1", "a2"]
+
+    with pytest.raises(QueueFull):
+        queue.put_many([track("c", "c1")])
+    with pytest.raises(QueueFull):
+        queue.put(track("c", "c1"))
+
+
+def test_played_tracks_count_against_capacity():
+    queue = build_queue(size=2)
+    queue.put(track("a", "a1"))
+    queue.get()
+
+    assert [item.title for item in queue.put_many([track("b", "b1"), track("b", "b2")])] == ["b1"]
+
+
+def test_remove_outside_the_queue_raises():
+    queue = build_queue()
+    queue.put(track("a", "a1"))
+
+    with pytest.raises(OutofList):
+        queue.remove(5)
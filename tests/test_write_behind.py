@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+import function
+from function import WriteBehindBuffer, update_db
+
+
+class Collection:
+    def __init__(self, name: str = "Users", delay: float = 0) -> None:
+        self.name: str = name
+        self.delay: float = delay
+        self.writes: list[list[UpdateOne]] = []
+
+        self.failures: list[Exception] = []
+
+    async def bulk_write(self, operations: list[UpdateOne], ordered: bool = True) -> None:
+        await asyncio.sleep(self.delay)
+        self.writes.append(operations)
+        if self.failures:
+            raise self.failures.pop(0)
+
+
+def test_updates_to_the_same_document_are_merged():
+    db, buffer = Collection(), WriteBehindBuffer()
+
+    async def run() -> None:
+        buffer.add(db, {"_id": 1}, {"$set": {"a": 1}})
+        buffer.add(db, {"_id": 1}, {"$set": {"b": 2}})
+        buffer.add(db, {"_id": 2}, {"$set": {"a": 3}})
+        assert buffer.pending == 2
+        await buffer.close()
+
+    asyncio.run(run())
+    assert db.writes == [[UpdateOne({"_id": 1}, {"$set": {"a": 1, "b": 2}}), UpdateOne({"_id": 2}, {"$set": {"a": 3}})]]
+
+
+def test_conflicting_updates_keep_their_order():
+    db, buffer = Collection(), WriteBehindBuffer()
+
+    async def run() -> None:
+        buffer.add(db, {"_id": 1}, {"$set": {"a": 1}})
+        buffer.add(db, {"_id": 1}, {"$unset": {"a": ""}})
+        await buffer.close()
+
+    asyncio.run(run())
+    assert db.writes == [[UpdateOne({"_id": 1}, {"$set": {"a": 1}}), UpdateOne({"_id": 1}, {"$unset": {"a": ""}})]]
+
+
+def test_document_stays_pending_while_it_is_written():
+    db, buffer = Collection(delay=0.05), WriteBehindBuffer()
+
+    async def run() -> None:
+        buffer.add(db, {"_id": 1}, {"$set": {"a": 1}})
+        flush = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0.01)
+        assert buffer.pending == 0 and buffer.is_pending(db, {"_id": 1})
+
+        await flush
+        assert not buffer.is_pending(db, {"_id": 1})
+        await buffer.close()
+
+    asyncio.run(run())
+
+
+def test_close_finishes_the_running_flush_and_writes_the_rest():
+    db, buffer = Collection(delay=0.05), WriteBehindBuffer(flush_interval=0)
+
+    async def run() -> None:
+        buffer.add(db, {"_id": 1}, {"$set": {"a": 1}})
+        await asyncio.sleep(0.01)  # The flush loop has taken the update and is writing it
+        buffer.add(db, {"_id": 2}, {"$set": {"a": 2}})
+        await buffer.close()
+
+        # Updates made after closing, e.g. by player teardown, are written straight away
+        buffer.add(db, {"_id": 3}, {"$set": {"a": 3}})
+        await buffer._task
+
+    asyncio.run(run())
+    assert db.writes == [
+        [UpdateOne({"_id": 1}, {"$set": {"a": 1}})],
+        [UpdateOne({"_id": 2}, {"$set": {"a": 2}})],
+        [UpdateOne({"_id": 3}, {"$set": {"a": 3}})],
+    ]
+
+
+def test_a_failed_update_only_drops_itself():
+    db, buffer = Collection(), WriteBehindBuffer()
+    db.failures.append(BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "bad update"}]}))
+
+    async def run() -> None:
+        for doc_id in range(1, 4):
+            buffer.add(db, {"_id": doc_id}, {"$set": {"a": doc_id}})
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert db.writes[-1] == [UpdateOne({"_id": 3}, {"$set": {"a": 3}})]
+    assert buffer.pending == 0
+
+
+def test_updates_are_kept_when_the_write_fails():
+    db, buffer = Collection(), WriteBehindBuffer()
+    db.failures.append(ConnectionError())
+
+    async def run() -> None:
+        buffer.add(db, {"_id": 1}, {"$set": {"a": 1}})
+        await buffer.flush()
+        assert buffer.pending == 1 and buffer.is_pending(db, {"_id": 1})
+
+        buffer.add(db, {"_id": 1}, {"$unset": {"a": ""}})
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert db.writes[-1] == [UpdateOne({"_id": 1}, {"$set": {"a": 1}}), UpdateOne({"_id": 1}, {"$unset": {"a": ""}})]
+
+
+@pytest.mark.parametrize(("size", "expected"), [(-3, [3, 4, 5]), (2, [1, 2]), (0, [])])
+def test_push_slice_trims_the_cached_array(monkeypatch, size: int, expected: list[int]):
+    monkeypatch.setattr(function, "DB_WRITER", WriteBehindBuffer(), raising=False)
+    document = {"history": [1, 2, 3]}
+
+    asyncio.run(
+        update_db(Collection(), document, {"_id": 1}, {"$push": {"history": {"$each": [4, 5], "$slice": size}}})
+    )
+    assert document["history"] == expected
@@ -41,7 +41,7 @@ PYTHON_CMD_NAME = os.path.basename(sys.executable)
 GITHUB_API_URL = "https://api.github.com/repos/ChocoMeow/Vocard/releases/latest"
 VOCARD_URL = "https://github.com/ChocoMeow/Vocard/archive/"
 MIGRATION_SCRIPT_URL = f"https://raw.githubusercontent.com/ChocoMeow/Vocard-Magration/main/{__version__}.py"
-IGNORE_FILES = ["settings.json", "logs", "last-session.json"]
+IGNORE_FILES = ["settings.json", "logs", "last-session.json", "node-sessions.json"]
 
 
 class bcolors:
@@ -212,12 +212,12 @@ class Add(ControlButton):
             return await self.send(interaction, "playlistAddError")
         user = await func.get_user(interaction.user.id, "playlist")
         rank, max_p, max_t = func.check_roles()
-        if len(user["200"]["tracks"]) >= max_t:
+        if func.playlist_size(user["200"]) >= max_t:
             return await self.send(interaction, "playlistlimited", max_t, ephemeral=True)
 
-        if track.track_id in user["200"]["tracks"]:
+        if await func.playlist_contains(interaction.user.id, "200", track.track_id):
             return await self.send(interaction, "playlistrepeated", ephemeral=True)
-        respond = await func.update_user(interaction.user.id, {"$push": {"playlist.200.tracks": track.track_id}})
+        respond = await func.add_playlist_tracks(interaction.user.id, "200", [track.track_id])
         if respond:
             await self.send(
                 interaction,
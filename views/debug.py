@@ -135,14 +135,16 @@ class NodesDropdown(discord.ui.Select):
         super().__init__(placeholder="Select a node to edit...", options=self.get_nodes())
 
     def get_nodes(self) -> list[discord.SelectOption]:
-        nodes = [
-            discord.SelectOption(
-                label=name,
-                description=("🟢 Connected" if node._available else "🔴 Disconnected")
-                + f" - Players: {node.player_count} ({node.latency if node._available else 0:.2f}ms)",
+        nodes = []
+        for name, node in voicelink.NodePool._nodes.items():
+            latency, jitter = (node.latency, node.latency_jitter) if node._available else (0, 0)
+            nodes.append(
+                discord.SelectOption(
+                    label=name,
+                    description=("🟢 Connected" if node._available else "🔴 Disconnected")
+                    + f" - Players: {node.player_count} ({latency:.2f}±{jitter:.2f}ms)",
+                )
             )
-            for name, node in voicelink.NodePool._nodes.items()
-        ]
 
         if not nodes:
             nodes = [discord.SelectOption(label="The node could not be found!")]
@@ -288,7 +290,9 @@ class NodesPanel(discord.ui.View):
                         f"• PLAYERS: {len(node._players)}\n"
                         f"• CPU:     {node.stats.cpu_process_load:.1f}%\n"
                         f"• RAM:     {func.format_bytes(node.stats.free)}/{func.format_bytes(total_memory, True)} ({(node.stats.free / total_memory) * 100:.1f}%)\n"
-                        f"• LATENCY: {node.latency:.2f}ms\n"
+                        f"• LATENCY: {node.latency:.2f}ms (±{node.latency_jitter:.2f}ms)\n"
+                        f"• EVENTS:  {node.dispatcher.depth} queued, "
+                        f"{node.dispatcher.lag:.2f}ms lag (max {node.dispatcher.max_lag:.2f}ms)\n"
                         f"• UPTIME:  {func.time(node.stats.uptime)}```",
                     )
                 else:
@@ -395,12 +399,16 @@ class DebugView(discord.ui.View):
         player_data = []
         for _identifier, node in voicelink.NodePool._nodes.items():
             for _guild_id, player in node._players.copy().items():
-                if player.guild.me is None or player.guild.me.voice or not player.current:
+                # The restore rejoins the saved channel, so only players in voice with a track are saved
+                if player.guild.me is None or not player.guild.me.voice or not player.current:
                     continue
 
                 player_data.append(player.data)
+
+                # A node that resumes sessions keeps playing the track through the restart, so the player
+                # is only cleaned up on the bot's side and the restored player takes the running track over
                 with contextlib.suppress(builtins.BaseException):
-                    await player.teardown()
+                    await player.teardown(destroy_remote=not node.resume_timeout)
 
         session_file_path = os.path.join(func.ROOT_DIR, func.LAST_SESSION_FILE_NAME)
         if os.path.exists(session_file_path):
@@ -31,6 +31,7 @@ import discord
 from tldextract import extract
 
 import function as func
+from voicelink.transformer import decode_many
 
 
 if TYPE_CHECKING:
@@ -63,7 +64,7 @@ class Select_playlist(discord.ui.Select):
             return await interaction.response.edit_message(embed=self.view.viewEmbed, view=self.view)
 
         self.view.current = self.view.results[int(self.values[0].split(". ")[0]) - 1]
-        self.view.page = ceil(len(self.view.current["tracks"]) / 7)
+        self.view.page = ceil(self.view.current["count"] / 7)
         self.view.current_page = 1
         self.view.toggle_btn(False)
         await interaction.response.edit_message(embed=await self.view.build_embed(), view=self.view)
@@ -101,9 +102,16 @@ class PlaylistView(discord.ui.View):
             if child.custom_id not in ("delete", "selector"):
                 child.disabled = action
 
+    async def get_tracks(self, start: int, stop: int) -> "list[Track] | list[dict[str, Any]]":
+        """Return the tracks shown on a page, loading stored playlists one page at a time."""
+        if "source" not in self.current:
+            return self.current["tracks"][start:stop]
+
+        return decode_many(await func.get_playlist_tracks(*self.current["source"], start, stop, raw=True))
+
     async def build_embed(self) -> discord.Embed:
         offset: int = self.current_page * 7
-        tracks: list[Track] = self.current["tracks"][(offset - 7) : offset]
+        tracks: list[Track] = await self.get_tracks(offset - 7, offset)
         texts = await func.get_lang(
             self.author.guild.id,
             "playlistView",
@@ -121,7 +129,7 @@ class PlaylistView(discord.ui.View):
             texts[1].format(
                 self.current["name"],
                 self.current["id"],
-                len(self.current["tracks"]),
+                self.current["count"],
                 owner if (owner := self.current.get("owner")) else f"{self.author.id} (You)",
                 self.current["type"],
             )
@@ -143,7 +151,7 @@ class PlaylistView(discord.ui.View):
 
         embed.description += f"\n\n**{texts[5]}:**\n"
         if tracks:
-            if self.current.get("type") == "playlist":
+            if "source" in self.current:
                 embed.description += "\n".join(
                     f"{func.get_source(track['sourceName'], 'emoji')} `{index:>2}.` `[{func.time(track['length'])}]` [{func.truncate_string(track['title'])}]({track['uri']})"
                     for index, track in enumerate(tracks, start=offset - 6)
@@ -27,6 +27,13 @@ __author__ = "Vocard Development, ChocoMeow"
 __license__ = "MIT"
 __copyright__ = "Copyright 2023 - present (c) Vocard Development, ChocoMeow"
 
+from .codec import (
+    JSONCodec as JSONCodec,
+    OrjsonCodec as OrjsonCodec,
+    StdlibCodec as StdlibCodec,
+    get_codec as get_codec,
+    set_codec as set_codec,
+)
 from .enums import LoopType, SearchType
 from .events import *
 from .exceptions import *
@@ -36,4 +43,4 @@ from .placeholders import Placeholders, build_embed
 from .player import Player, connect_channel
 from .pool import *
 from .queue import *
-from .transformer import decode, encode
+from .transformer import decode, decode_many as decode_many, encode
@@ -0,0 +1,150 @@
+"""
+MIT License.
+
+Copyright (c) 2023 - present Vocard Development
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+__all__ = [
+    "JSONCodec",
+    "OrjsonCodec",
+    "StdlibCodec",
+    "get_codec",
+    "set_codec",
+]
+
+
+class JSONCodec(ABC):
+    """
+    The base class for the JSON codec used on the Lavalink and dashboard connections.
+
+    `loads` accepts bytes as well as str, so REST bodies can be decoded straight from the wire.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """Decode a JSON document."""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a JSON string."""
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Encode an object as UTF-8 JSON bytes."""
+        return self.dumps(obj).encode()
+
+    def __repr__(self) -> str:
+        return f"<Voicelink.JSONCodec name={self.name!r}>"
+
+
+class StdlibCodec(JSONCodec):
+    """The codec backed by the `json` module of the standard library."""
+
+    name = "json"
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode a JSON document, decoding bytes as UTF-8 first."""
+        if isinstance(data, bytes | bytearray | memoryview):
+            data = bytes(data).decode()
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a compact JSON string."""
+        return self._encoder.encode(obj)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    The codec backed by `orjson`, which parses bytes natively and serializes straight to bytes.
+
+    orjson is installed with the `speed` extra; without it the codec raises `ImportError` on creation.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson, install it with the 'speed' extra.")
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode a JSON document from bytes or str."""
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a JSON string."""
+        return orjson.dumps(obj, option=self._options).decode()
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Encode an object as UTF-8 JSON bytes without an intermediate str."""
+        return orjson.dumps(obj, option=self._options)
+
+
+class _CodecState:
+    """Holds the codec in use so `set_codec` can swap it without rebinding a module global."""
+
+    __slots__ = ("codec",)
+
+    def __init__(self, codec: JSONCodec) -> None:
+        self.codec = codec
+
+
+def _default_codec() -> JSONCodec:
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibCodec()
+
+
+_state = _CodecState(_default_codec())
+
+
+def get_codec() -> JSONCodec:
+    """Return the codec currently in use."""
+    return _state.codec
+
+
+def set_codec(codec: JSONCodec | str) -> JSONCodec:
+    """Replace the codec in use, either with an instance or by name ("orjson" or "json")."""
+    if isinstance(codec, str):
+        codecs = {OrjsonCodec.name: OrjsonCodec, StdlibCodec.name: StdlibCodec}
+        if codec not in codecs:
+            raise ValueError(f"Unknown JSON codec '{codec}'.")
+        codec = codecs[codec]()
+
+    _state.codec = codec
+    return codec
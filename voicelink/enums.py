@@ -111,12 +111,16 @@ class NodeAlgorithm(Enum):
     NodeAlgorithm.by_region returns a node based on its voice region,
     which the region is specified by the user in the method as an arg.
     This method will only work if you set a voice region when you create a node.
+
+    NodeAlgorithm.by_load returns the node with the lowest load penalty, computed
+    from the CPU, memory and audio frame stats reported by Lavalink.
     """
 
     # We don't have to define anything special for these, since these just serve as flags
     BY_PING = auto()
     BY_REGION = auto()
     BY_PLAYERS = auto()
+    BY_LOAD = auto()
 
     def __str__(self) -> str:
         return self.value
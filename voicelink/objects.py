@@ -22,7 +22,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from __future__ import annotations
+
 import re
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, ClassVar
+from weakref import WeakValueDictionary
 
 from discord import Member
 from tldextract import extract
@@ -36,31 +43,89 @@ from .transformer import encode
 YOUTUBE_REGEX = re.compile(r"(https?://)?(www\.)?youtube\.(com|nl)/watch\?v=([-\w]+)")
 
 
-class Track:
+class TrackInfo:
     """
-    The base track object. Returns critical track information needed for parsing by Lavalink.
-    You can also pass in commands.Context to get a discord.py Context object in your track.
+    The immutable metadata record of a track.
+
+    Records are interned by track ID, so every Track object created for the same song shares one instance.
     """
 
     __slots__ = (
-        "_search_type",
-        "_track_id",
+        "__weakref__",
         "author",
         "emoji",
-        "end_time",
         "identifier",
         "info",
         "is_seekable",
         "is_stream",
         "length",
-        "position",
-        "requester",
         "source",
         "thumbnail",
         "title",
+        "track_id",
         "uri",
     )
 
+    _interned: ClassVar[WeakValueDictionary[str, TrackInfo]] = WeakValueDictionary()
+
+    def __init__(self, track_id: str | None, info: dict) -> None:
+        uri: str = info.get("uri", "https://discord.com/application-directory/605618911471468554")
+        identifier: str = info.get("identifier")
+        source: str = sys.intern(info.get("sourceName", extract(uri).domain))
+
+        thumbnail: str = info.get("artworkUrl")
+        if not thumbnail and YOUTUBE_REGEX.match(uri):
+            thumbnail = f"https://img.youtube.com/vi/{identifier}/maxresdefault.jpg"
+
+        setattr_ = object.__setattr__
+        setattr_(self, "track_id", track_id)
+        setattr_(self, "info", MappingProxyType(info))
+        setattr_(self, "identifier", identifier)
+        setattr_(self, "title", info.get("title", "Unknown"))
+        setattr_(self, "author", info.get("author", "Unknown"))
+        setattr_(self, "uri", uri)
+        setattr_(self, "source", source)
+        setattr_(self, "thumbnail", thumbnail)
+        setattr_(self, "emoji", get_source(source, "emoji"))
+        setattr_(self, "length", info.get("length"))
+        setattr_(self, "is_stream", info.get("isStream", False))
+        setattr_(self, "is_seekable", info.get("isSeekable", True))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"<Voicelink.TrackInfo title={self.title!r} uri=<{self.uri!r}> length={self.length}>"
+
+    @classmethod
+    def get(cls, track_id: str | None, info: dict) -> TrackInfo:
+        """Return the shared record for the track ID, creating it on first use."""
+        if not track_id:
+            return cls(track_id, info)
+
+        if (record := cls._interned.get(track_id)) is None:
+            record = cls._interned[track_id] = cls(track_id, info)
+
+        return record
+
+
+class Track:
+    """
+    The base track object. Returns critical track information needed for parsing by Lavalink.
+    You can also pass in commands.Context to get a discord.py Context object in your track.
+    """
+
+    __slots__ = (
+        "_info",
+        "_search_type",
+        "end_time",
+        "position",
+        "requester",
+    )
+
     def __init__(
         self,
         *,
@@ -69,26 +134,10 @@ class Track:
         requester: Member,
         search_type: SearchType = SearchType.YOUTUBE,
     ):
-        self._track_id: str | None = track_id
-        self.info: dict = info
-
-        self.identifier: str = info.get("identifier")
-        self.title: str = info.get("title", "Unknown")
-        self.author: str = info.get("author", "Unknown")
-        self.uri: str = info.get("uri", "https://discord.com/application-directory/605618911471468554")
-        self.source: str = info.get("sourceName", extract(self.uri).domain)
+        self._info: TrackInfo = TrackInfo.get(track_id, info)
         self._search_type: SearchType = search_type
 
-        self.thumbnail: str = info.get("artworkUrl")
-        if not self.thumbnail and YOUTUBE_REGEX.match(self.uri):
-            self.thumbnail = f"https://img.youtube.com/vi/{self.identifier}/maxresdefault.jpg"
-
-        self.emoji: str = get_source(self.source, "emoji")
-        self.length: float = info.get("length")
-
         self.requester: Member = requester
-        self.is_stream: bool = info.get("isStream", False)
-        self.is_seekable: bool = info.get("isSeekable", True)
         self.position: int = info.get("position", 0)
 
         self.end_time: int | None = None
@@ -107,10 +156,63 @@ class Track:
 
     @property
     def track_id(self) -> str:
-        if not self._track_id:
-            self._track_id = encode(self.info)
+        """The base64 track ID, encoded from the info when Lavalink did not provide one."""
+        return self._info.track_id or encode(self._info.info)
+
+    @property
+    def info(self) -> Mapping[str, Any]:
+        """The raw Lavalink track info."""
+        return self._info.info
+
+    @property
+    def identifier(self) -> str:
+        """The identifier of the track on its source."""
+        return self._info.identifier
+
+    @property
+    def title(self) -> str:
+        """The title of the track."""
+        return self._info.title
+
+    @property
+    def author(self) -> str:
+        """The author of the track."""
+        return self._info.author
 
-        return self._track_id
+    @property
+    def uri(self) -> str:
+        """The URL of the track."""
+        return self._info.uri
+
+    @property
+    def source(self) -> str:
+        """The name of the source the track was found on."""
+        return self._info.source
+
+    @property
+    def thumbnail(self) -> str:
+        """The URL of the track artwork."""
+        return self._info.thumbnail
+
+    @property
+    def emoji(self) -> str:
+        """The emoji of the track source."""
+        return self._info.emoji
+
+    @property
+    def length(self) -> float:
+        """The length of the track in milliseconds."""
+        return self._info.length
+
+    @property
+    def is_stream(self) -> bool:
+        """Whether the track is a live stream."""
+        return self._info.is_stream
+
+    @property
+    def is_seekable(self) -> bool:
+        """Whether the track can be seeked."""
+        return self._info.is_seekable
 
     @property
     def formatted_length(self) -> str:
@@ -24,8 +24,12 @@ SOFTWARE.
 
 from __future__ import annotations
 
+import ast
+import operator
 import re
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any, TYPE_CHECKING
 
 from discord import Client, Embed
 
@@ -36,6 +40,19 @@ if TYPE_CHECKING:
     from .objects import Track
     from .player import Player
 
+VARIABLE_PATTERN = re.compile(r"@@(.*?)@@")
+CONDITION_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+COMPARE_OPERATORS: dict[type[ast.cmpop], Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
 
 def ensure_track(func) -> callable:
     def wrapper(self: Placeholders, *args, **kwargs):
@@ -161,54 +178,165 @@ class Placeholders:
     def bot_icon(self) -> str:
         return self.bot.user.display_avatar.url if self.player else "https://i.imgur.com/dIFBwU7.png"
 
-    def replace(self, text: str, variables: dict[str, str]) -> str:
-        if not text or text.isspace():
-            return None
-        pattern = r"\{\{(.*?)\}\}"
-        matches: list[str] = re.findall(pattern, text)
-
-        for match in matches:
-            parts: list[str] = match.split("??")
-            expression = parts[0].strip()
-            true_value, false_value = "", ""
-
-            # Split the true and false values
-            if "//" in parts[1]:
-                true_value, false_value = [part.strip() for part in parts[1].split("//")]
-            else:
-                true_value = parts[1].strip()
-
-            try:
-                # Replace variable placeholders with their values
-                expression = re.sub(
-                    r"@@(.*?)@@",
-                    lambda x: "'" + variables.get(x.group(1), "") + "'",
-                    expression,
-                )
-                expression = re.sub(r"'(\d+)'", lambda x: str(int(x.group(1))), expression)
-                expression = re.sub(
-                    r"'(\d+)'\s*([><=!]+)\s*(\d+)",
-                    lambda x: f"{int(x.group(1))} {x.group(2)} {int(x.group(3))}",
-                    expression,
-                )
+    def resolve(self) -> ResolvedVariables:
+        """Return a mapping that evaluates each variable the first time a template reads it."""
+        return ResolvedVariables(self.variables)
+
+    def replace(self, text: str, variables: Mapping[str, Any] | None = None) -> str:
+        return compile_template(text)(self.resolve() if variables is None else variables)
+
+
+class ResolvedVariables(dict):
+    """A lazily filled mapping of placeholder values, keeping each value once it has been computed."""
+
+    def __init__(self, variables: dict[str, Any]) -> None:
+        super().__init__()
+        self._variables: dict[str, Any] = variables
+
+    def __missing__(self, key: str) -> Any:
+        value = self._variables[key]
+        value = self[key] = value() if callable(value) else value
+        return value
+
+
+def _lookup(variables: Mapping[str, Any], name: str) -> Any:
+    try:
+        return variables[name]
+    except KeyError:
+        return ""
+
+
+def _literal(value: Any) -> Any:
+    # Numbers in templates are written as strings, compare them as integers.
+    return int(value) if isinstance(value, str) and value.isdecimal() else value
+
+
+def _compile_expression(node: ast.expr, names: dict[str, str]) -> Callable[[Mapping[str, Any]], Any]:
+    if isinstance(node, ast.Constant):
+        value = _literal(node.value)
+        return lambda _: value
+
+    if isinstance(node, ast.Name):
+        if (name := names.get(node.id)) is not None:
+            return lambda variables: _literal(str(_lookup(variables, name)))
+
+        key = node.id
+        return lambda variables: variables[key]
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _compile_expression(node.operand, names)
+        return lambda variables: not operand(variables)
+
+    if isinstance(node, ast.BoolOp):
+        values = [_compile_expression(value, names) for value in node.values]
+        combine = all if isinstance(node.op, ast.And) else any
+        return lambda variables: combine(value(variables) for value in values)
+
+    if isinstance(node, ast.Compare):
+        left = _compile_expression(node.left, names)
+        comparisons = [
+            (COMPARE_OPERATORS[type(op)], _compile_expression(comparator, names))
+            for op, comparator in zip(node.ops, node.comparators, strict=True)
+        ]
+
+        def compare(variables: Mapping[str, Any]) -> bool:
+            a = left(variables)
+            for op, comparator in comparisons:
+                b = comparator(variables)
+                if not op(a, b):
+                    return False
+                a = b
+            return True
+
+        return compare
+
+    raise ValueError(f"Unsupported template expression: {ast.dump(node)}")
+
+
+def _compile_text(text: str) -> Callable[[Mapping[str, Any]], str]:
+    parts = VARIABLE_PATTERN.split(text)
+    if len(parts) == 1:
+        return lambda _: text
+
+    literals, names = parts[0::2], parts[1::2]
+
+    def render(variables: Mapping[str, Any]) -> str:
+        result = [literals[0]]
+        for name, literal in zip(names, literals[1:], strict=True):
+            result.append(str(_lookup(variables, name)))
+            result.append(literal)
+        return "".join(result)
+
+    return render
+
+
+def _compile_condition(body: str) -> Callable[[Mapping[str, Any]], str]:
+    parts = body.split("??")
+    if len(parts) < 2:
+        return lambda _: ""
+
+    true_value, false_value = parts[1].strip(), ""
+    if "//" in parts[1]:
+        try:
+            true_value, false_value = [part.strip() for part in parts[1].split("//")]
+        except ValueError:
+            return lambda _: ""
+
+    names: dict[str, str] = {}
+
+    def alias(match: re.Match) -> str:
+        identifier = f"_v{len(names)}"
+        names[identifier] = match.group(1)
+        return identifier
+
+    try:
+        tree = ast.parse(VARIABLE_PATTERN.sub(alias, parts[0].strip()), mode="eval")
+        predicate = _compile_expression(tree.body, names)
+    except (SyntaxError, ValueError, KeyError):
+        return lambda _: ""
+
+    render_true, render_false = _compile_text(true_value), _compile_text(false_value)
+
+    def render(variables: Mapping[str, Any]) -> str:
+        try:
+            result = predicate(variables)
+        except Exception:
+            return ""
+        return render_true(variables) if result else render_false(variables)
+
+    return render
+
 
-                # Evaluate the expression
-                result = eval(expression, {"__builtins__": None}, variables)
+@lru_cache(maxsize=512)
+def compile_template(text: str | None) -> Callable[[Mapping[str, Any]], str | None]:
+    """
+    Compiles a placeholder template into a render function.
 
-                # Replace the match with the true or false value based on the result
-                replacement = true_value if result else false_value
-                text = text.replace("{{" + match + "}}", replacement)
+    `@@name@@` is replaced by the value of the variable and `{{expression ?? true // false}}`
+    renders one of its branches depending on the expression, which may compare variables
+    and literals and combine them with `and`, `or` and `not`. Compiled templates are cached
+    by their text, and rendering only reads the variables the template references.
+    """
+    if not text or text.isspace():
+        return lambda _: None
 
-            except:
-                text = text.replace("{{" + match + "}}", "")
+    segments = []
+    position = 0
+    for match in CONDITION_PATTERN.finditer(text):
+        segments.append(_compile_text(text[position : match.start()]))
+        segments.append(_compile_condition(match.group(1)))
+        position = match.end()
+    segments.append(_compile_text(text[position:]))
 
-        return re.sub(r"@@(.*?)@@", lambda x: str(variables.get(x.group(1), "")), text)
+    if len(segments) == 1:
+        return segments[0]
+    return lambda variables: "".join(segment(variables) for segment in segments)
 
 
 def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
     embed = Embed()
     try:
-        rv = {key: func() if callable(func) else func for key, func in placeholder.variables.items()}
+        rv = placeholder.resolve()
         if author := raw.get("author"):
             embed.set_author(
                 name=placeholder.replace(author.get("name"), rv),
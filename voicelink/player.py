@@ -22,11 +22,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import builtins
+import asyncio
 import contextlib
 import logging
 import time
 from asyncio import sleep
+from itertools import chain
 from math import ceil
 from random import choice, shuffle
 from typing import Any
@@ -49,7 +50,7 @@ import function as func
 from views import InteractiveController
 
 from . import events
-from .enums import LoopType, RequestMethod, SearchType
+from .enums import LoopType, NodeAlgorithm, RequestMethod, SearchType
 from .events import TrackEndEvent, TrackExceptionEvent, TrackStartEvent, VoicelinkEvent
 from .exceptions import (
     DuplicateTrack,
@@ -63,6 +64,12 @@ from .objects import Playlist, Track
 from .placeholders import Placeholders, build_embed
 from .pool import Node, NodePool
 from .queue import Queue
+from .utils import TokenBucket
+
+
+# Discord allows roughly 5 message edits per 5 seconds in a channel, shared by every player writing there.
+CONTROLLER_RATELIMITS: dict[int, TokenBucket] = {}
+CONTROLLER_DEBOUNCE: float = 0.5
 
 
 async def connect_channel(ctx: commands.Context | Interaction, channel: VoiceChannel = None):
@@ -141,7 +148,11 @@ class Player(VoiceProtocol):
             self.get_msg,
         )
 
-        self._node = NodePool.get_node()
+        # A node that resumed its session may still be playing for this guild, reuse it so the track carries on
+        resumed_node = NodePool.get_resumed_node(self._guild.id) if self._guild else None
+        self._node = resumed_node or NodePool.get_best_node(algorithm=NodeAlgorithm.BY_LOAD)
+        self._failover_from: str | None = None  # Identifier of the node this player was evacuated from
+        self._pending_node: str | None = None  # Node the rebalancer wants this player on at the next track
         self._current: Track | None = None
         self._filters: Filters = Filters()
         self._paused: bool = False
@@ -157,7 +168,9 @@ class Player(VoiceProtocol):
         self._voice_state: dict = {}
 
         self.controller: Message | PartialMessage = None
-        self._updating: bool = False
+        self._controller_task: asyncio.Task | None = None
+        self._controller_pending: bool = False
+        self._controller_sending: bool = False
 
         self.pause_votes = set()
         self.resume_votes = set()
@@ -260,7 +273,7 @@ class Player(VoiceProtocol):
             "guild_id": self._guild.id,
             "channel_id": self.channel.id,
             "queue": {
-                "tracks": [track.data for track in self.queue._queue],
+                "tracks": [track.data for track in chain(self.queue._history, self.queue._upcoming)],
                 "position": self.queue._position,
                 "repeat_mode": self.queue._repeat.current.name,
                 "repeat_position": self.queue._repeat_position,
@@ -335,24 +348,35 @@ class Player(VoiceProtocol):
         uri: str = f"sessions/{self._node._session_id}/players/{self._guild.id}" + (f"?{query}" if query else "")
         return await self._node.send(method, query=uri, data=data)
 
-    async def _update_state(self, data: dict) -> None:
-        """Updates the player's state based on the provided data."""
-        state: dict = data.get("state")
+    def _update_state(self, data: dict) -> None:
+        """
+        Update the player's state based on the provided data.
+
+        This runs for every playerUpdate, so it only stores the state and leaves publishing it to the IPC publisher.
+        """
+        state: dict = data["state"]
         self._last_update = time.time() * 1000
         self._is_connected = state.get("connected")
         self._last_position = state.get("position")
         self._ping = state.get("ping")
-        self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) update state with data {data}")
 
-        if self.is_ipc_connected:
-            await self.send_ws(
-                {
-                    "op": "playerUpdate",
-                    "lastUpdate": self._last_update,
-                    "isConnected": self._is_connected,
-                    "lastPosition": self._last_position,
-                }
-            )
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) update state with data {data}")
+
+        if self._ipc_connection and self._ipc._is_connected:
+            self._ipc.publisher.mark(self)
+
+    def _sync_resumed_state(self, data: dict) -> bool:
+        """Take over the state of a player Lavalink kept alive through a resumed session."""
+        if not self._current or (data.get("track") or {}).get("encoded") != self._current.track_id:
+            return False
+
+        state: dict = data.get("state", {})
+        self._last_update = time.time() * 1000
+        self._last_position = state.get("position", 0)
+        self._paused = data.get("paused", False)
+        self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) resumed from the node session.")
+        return True
 
     async def _dispatch_voice_update(self, voice_data: dict[str, Any] | None = None) -> None:
         """Dispatches a voice update to the node."""
@@ -431,6 +455,12 @@ class Player(VoiceProtocol):
         if not self.guild.me.voice:
             await self.connect(timeout=0.0, reconnect=True)
 
+        # Nothing is playing between tracks, so this is the cheapest moment to switch nodes
+        if identifier := self._pending_node:
+            self._pending_node = None
+            if identifier != self._node._identifier and (node := NodePool._nodes.get(identifier)) and node._available:
+                await self.change_node(identifier)
+
         self.pause_votes.clear()
         self.resume_votes.clear()
         self.skip_votes.clear()
@@ -458,7 +488,7 @@ class Player(VoiceProtocol):
                 self._bot.loop.create_task(
                     func.update_user(
                         track.requester.id,
-                        {"$push": {"history": {"$each": [track.track_id], "$slice": -25}}},
+                        {"$push": {"history": {"$each": [func.pack_track_id(track.track_id)], "$slice": -25}}},
                     )
                 )
 
@@ -477,14 +507,40 @@ class Player(VoiceProtocol):
         return None
 
     async def invoke_controller(self) -> None:
-        """Sends or updates the music controller message in the designated channel."""
-        if not self.settings.get("controller", True):
-            return
+        """
+        Schedules an update of the music controller message in the designated channel.
 
-        if self._updating or not self.channel:
+        Updates are coalesced: while an edit is in flight or waiting for the channel
+        rate limit, further calls only mark the controller as outdated, and a single
+        trailing edit renders the latest player state.
+        """
+        if not self.settings.get("controller", True) or not self.channel:
             return
 
-        self._updating = True
+        self._controller_pending = True
+        if not self._controller_task or self._controller_task.done():
+            self._controller_task = self._bot.loop.create_task(self._run_controller_updates())
+
+    async def _run_controller_updates(self) -> None:
+        """Process pending controller updates until the controller is up to date."""
+        while self._controller_pending:
+            await sleep(CONTROLLER_DEBOUNCE)
+
+            channel = self.controller.channel if self.controller else self.context.channel
+            bucket = CONTROLLER_RATELIMITS.setdefault(channel.id, TokenBucket(rate=1.0, capacity=5))
+            await bucket.acquire()
+
+            self._controller_pending = False
+            self._controller_sending = True
+            try:
+                await self._update_controller()
+            finally:
+                self._controller_sending = False
+
+    async def _update_controller(self) -> None:
+        """Send or update the music controller message with the current state."""
+        if not self.channel:
+            return
 
         try:
             embed, view = self.build_embed(self.current), InteractiveController(self)
@@ -520,9 +576,6 @@ class Player(VoiceProtocol):
                 exc_info=e,
             )
 
-        finally:
-            self._updating = False
-
     async def is_position_fresh(self) -> bool:
         """Checks if the current controller message is among the most recent messages."""
         try:
@@ -534,8 +587,13 @@ class Player(VoiceProtocol):
 
         return False
 
-    async def teardown(self) -> None:
-        """Cleans up the player and associated resources."""
+    async def teardown(self, *, destroy_remote: bool = True) -> None:
+        """
+        Clean up the player and associated resources.
+
+        With `destroy_remote` set to False the player stays in voice and alive on the node,
+        so a resumed session can take it over.
+        """
         try:
             await func.update_settings(
                 self.guild.id,
@@ -550,11 +608,26 @@ class Player(VoiceProtocol):
                 },
             )
 
+            self._ipc.publisher.forget(self.guild.id)
             if self.is_ipc_connected:
                 await self.send_ws({"op": "playerClose"})
         except:
             pass
 
+        if task := self._controller_task:
+            self._controller_pending = False
+            if self._controller_sending:
+                # Let the send in progress finish, otherwise the message it creates is never cleaned up below.
+                # wait() leaves the task's own errors alone but still lets a cancelled teardown stop here.
+                await asyncio.wait({task})
+            else:
+                # Still debouncing or waiting for the rate limit, nothing has been sent yet
+                task.cancel()
+
+        for channel in (self.controller.channel if self.controller else None, self.context.channel):
+            if channel:
+                CONTROLLER_RATELIMITS.pop(channel.id, None)
+
         try:
             await self.update_voice_status(remove_status=True)
             if self.controller and self.controller.id == self.settings.get("music_request_channel", {}).get(
@@ -566,7 +639,11 @@ class Player(VoiceProtocol):
         except:
             pass
 
-        with contextlib.suppress(builtins.BaseException):
+        if not destroy_remote:
+            self._node._players.pop(self.guild.id, None)
+            return
+
+        with contextlib.suppress(Exception):
             await self.destroy()
 
     async def get_tracks(
@@ -642,6 +719,13 @@ class Player(VoiceProtocol):
         if not self._node:
             return track
 
+        # The node may still be playing this track from a resumed session, pick it up instead of reloading it
+        if state := self._node.claim_resumed_player(self.guild.id):
+            previous, self._current = self._current, track
+            if self._sync_resumed_state(state):
+                return self._current
+            self._current = previous
+
         data = {"encodedTrack": track.track_id, "position": str(start or 0)}
 
         if end or track.end_time:
@@ -690,46 +774,49 @@ class Player(VoiceProtocol):
         duplicate: bool = True,
     ) -> int:
         """Adds one or more tracks to the queue."""
-        tracks: list[Track] = []
-        _duplicate_tracks = (
-            [] if self.queue._allow_duplicate and duplicate else [track.uri for track in self.queue._queue]
+        seen_uris: set[str] = (
+            set()
+            if self.queue._allow_duplicate and duplicate
+            else {track.uri for track in chain(self.queue._history, self.queue._upcoming)}
         )
         raw_tracks = raw_tracks[0] if isinstance(raw_tracks, list) and len(raw_tracks) == 1 else raw_tracks
 
-        try:
-            if is_list := isinstance(raw_tracks, list):
-                for track in raw_tracks:
-                    if track.uri in _duplicate_tracks:
-                        continue
-
-                    self._validate_time(track, start_time, end_time)
-                    self.queue.put_at_front(track) if at_front else self.queue.put(track)
-                    tracks.append(track)
-                    _duplicate_tracks.append(track.uri)
-            else:
-                if raw_tracks.uri in _duplicate_tracks:
-                    raise DuplicateTrack(self.get_msg("voicelinkDuplicateTrack"))
+        if is_list := isinstance(raw_tracks, list):
+            tracks: list[Track] = []
+            for track in raw_tracks:
+                if track.uri in seen_uris:
+                    continue
 
-                self._validate_time(raw_tracks, start_time, end_time)
-                position = self.queue.put_at_front(raw_tracks) if at_front else self.queue.put(raw_tracks)
-                tracks.append(raw_tracks)
+                self._validate_time(track, start_time, end_time)
+                tracks.append(track)
+                seen_uris.add(track.uri)
 
-        finally:
-            if tracks:
-                if self.is_ipc_connected:
-                    await self.send_ws(
-                        {
-                            "op": "addTrack",
-                            "tracks": [track.track_id for track in tracks],
-                            "position": -1 if is_list else position,
-                        },
-                        tracks[0].requester,
-                    )
+            if not tracks:
+                return None
 
-                self._logger.debug(
-                    f"Player in {self.guild.name}({self.guild.id}) has been added {len(tracks)} tracks into the queue."
-                )
-                return len(tracks) if is_list else position
+            tracks = self.queue.put_many(tracks, at_front=at_front)
+        else:
+            if raw_tracks.uri in seen_uris:
+                raise DuplicateTrack(self.get_msg("voicelinkDuplicateTrack"))
+
+            self._validate_time(raw_tracks, start_time, end_time)
+            position = self.queue.put_at_front(raw_tracks) if at_front else self.queue.put(raw_tracks)
+            tracks = [raw_tracks]
+
+        if self.is_ipc_connected:
+            await self.send_ws(
+                {
+                    "op": "addTrack",
+                    "tracks": [track.track_id for track in tracks],
+                    "position": -1 if is_list else position,
+                },
+                tracks[0].requester,
+            )
+
+        self._logger.debug(
+            f"Player in {self.guild.name}({self.guild.id}) has been added {len(tracks)} tracks into the queue."
+        )
+        return len(tracks) if is_list else position
 
     async def remove_track(
         self,
@@ -936,21 +1023,34 @@ class Player(VoiceProtocol):
 
         self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been removed all filters.")
 
-    async def change_node(self, identifier: str | None = None) -> None:
-        """Changes the audio processing node for the guild.."""
+    async def change_node(self, identifier: str | None = None, *, position: int | None = None) -> None:
+        """Change the audio processing node for the guild, resuming at `position` if given."""
         try:
             node = NodePool.get_node(identifier=identifier)
         except:
             return await self.teardown()
 
-        self._node._players.pop(self.guild.id)
+        old_node = self._node
+        old_node._players.pop(self.guild.id, None)
+        if old_node is not node and old_node._available:
+            # Destroy the player on the old node first, otherwise it keeps playing there
+            try:
+                await self.send(method=RequestMethod.DELETE)
+                old_node._players_moved_away += 1
+            except Exception as e:
+                self._logger.warning(
+                    f"Failed to destroy the player of {self.guild.name}({self.guild.id}) "
+                    f"on node [{old_node._identifier}]",
+                    exc_info=e,
+                )
+
         self._node = node
         self._node._players[self.guild.id] = self
 
         await self._dispatch_voice_update(self._voice_state)
 
         if self.current:
-            await self.play(self.current, start=self.position)
+            await self.play(self.current, start=self.position if position is None else position)
             self._last_update = time.time() * 1000
 
             if self.is_paused:
@@ -980,8 +1080,7 @@ class Player(VoiceProtocol):
             return
 
         try:
-            rv = {key: func() if callable(func) else func for key, func in self._ph.variables.items()}
-            status = None if remove_status else self._ph.replace(text=template, variables=rv)
+            status = None if remove_status else self._ph.replace(text=template)
             # if self.channel.status != status:
             if self.channel.type == ChannelType.voice:
                 await self.channel.edit(status=status)
@@ -26,8 +26,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import os
 import re
+import time
 from typing import Any, TYPE_CHECKING
 from urllib.parse import quote
 
@@ -36,6 +36,7 @@ from discord import Client, Member
 from discord.ext.commands import Bot
 
 from . import __version__
+from .codec import get_codec
 from .enums import NodeAlgorithm, RequestMethod, SearchType
 from .exceptions import (
     NoNodesAvailable,
@@ -47,7 +48,7 @@ from .exceptions import (
 )
 from .objects import Playlist, Track
 from .ratelimit import STRATEGY, YTRatelimit, YTToken
-from .utils import ExponentialBackoff, NodeInfo, NodeStats, Ping
+from .utils import EventDispatcher, ExponentialBackoff, LatencyProber, NodeInfo, NodeStats, TokenBucket
 
 
 if TYPE_CHECKING:
@@ -76,8 +77,12 @@ class Node:
         secure: bool = False,
         heartbeat: int = 30,
         yt_ratelimit: dict | None = None,
+        recovery: dict | None = None,
+        failover: dict | None = None,
+        resuming: dict | None = None,
+        dispatcher: dict | None = None,
         session: aiohttp.ClientSession | None = None,
-        resume_key: str | None = None,
+        session_id: str | None = None,
         logger: logging.Logger | None = None,
     ):
         self._bot: Bot = bot
@@ -99,19 +104,41 @@ class Node:
         self._websocket: aiohttp.ClientWebSocketResponse = None
         self._task: asyncio.Task = None
 
-        self.resume_key: str = resume_key or str(os.urandom(8).hex())
-        self._session_id: str = None
+        self._session_id: str | None = session_id
         self._available: bool = None
+        self._ready: asyncio.Event = asyncio.Event()
+        self._resumed: bool = False
+        self._resumed_players: dict[int, dict] = {}
 
         self._headers: dict[str, str] = {
             "Authorization": self._password,
             "User-Id": str(bot.user.id),
             "Client-Name": f"Voicelink/{__version__}",
-            "Resume-Key": self.resume_key,
         }
 
         self._players: dict[int, Player] = {}
         self._info: NodeInfo | None = None
+        self._stats: NodeStats | None = None
+        self._players_moved_away: int = 0  # Players moved to another node since the last stats report
+        self._prober: LatencyProber = LatencyProber(self._host, self._port)
+        self._dispatcher: EventDispatcher = EventDispatcher(
+            self._handle_payload, workers=(dispatcher or {}).get("workers", 8), logger=self._logger
+        )
+
+        recovery = recovery or {}
+        self.recovery_concurrency: int = recovery.get("concurrency", 10)
+        self.recovery_rate: float = recovery.get("rate", 5.0)
+        self.recovery_delay: float = recovery.get("delay", 2.0)
+
+        failover = failover or {}
+        self.failover_grace_period: float = failover.get("grace_period", 30.0)
+        self.failover_concurrency: int = failover.get("concurrency", 5)
+        self.failover_rate: float = failover.get("rate", 5.0)
+        self.failback: bool = failover.get("failback", True)
+        self._failover_task: asyncio.Task | None = None
+
+        resuming = resuming or {}
+        self.resume_timeout: int = resuming.get("timeout", 60) if resuming.get("enable", True) else 0
 
         self.yt_ratelimit: YTRatelimit | None = (
             STRATEGY.get(yt_ratelimit.get("strategy"))(self, yt_ratelimit) if yt_ratelimit else None
@@ -158,10 +185,31 @@ class Node:
         """Property which returns the pool this node is apart of."""
         return self._pool
 
+    @property
+    def penalty(self) -> float:
+        """Property which returns the load penalty of the node, lower means more spare capacity."""
+        if self._stats is None:
+            return float(self.player_count)
+
+        # Stats arrive once a minute, so count players created or moved away since the last report too
+        stats = self._stats
+        moved_away = min(self._players_moved_away, stats.players_active or 0)
+        return stats.penalty + max(0, self.player_count - (stats.players_total or 0)) - moved_away
+
+    @property
+    def dispatcher(self) -> EventDispatcher:
+        """Property which returns the dispatcher handling this node's websocket payloads."""
+        return self._dispatcher
+
     @property
     def latency(self) -> float:
-        """Property which returns the latency of the node."""
-        return Ping(self._host, port=self._port).get_ping()
+        """Property which returns the smoothed latency of the node in milliseconds, or 0 if it has not been measured."""
+        return self._prober.latency or 0.0
+
+    @property
+    def latency_jitter(self) -> float:
+        """Property which returns how much the node's latency varies between samples, in milliseconds."""
+        return self._prober.jitter
 
     async def _update_handler(self, data: dict) -> None:
         await self._bot.wait_until_ready()
@@ -204,7 +252,9 @@ class Node:
                     self._logger.error(f"WebSocket error for node [{self._identifier}]")
                     break
 
-                self._bot.loop.create_task(self._handle_payload(msg.json()))
+                # Payloads of the same guild are handled in order, stats and ready payloads share one mailbox
+                data = get_codec().loads(msg.data)
+                self._dispatcher.put(data.get("guildId"), data)
 
             except aiohttp.ClientConnectionError as e:
                 self._logger.error(f"Connection error: {e}")
@@ -216,6 +266,9 @@ class Node:
                 self._available = False
                 break
 
+        if not self._available:
+            self._failover_task = self._bot.loop.create_task(self._failover())
+
         while not self._available:
             retry = backoff.delay()
             self._logger.info(f"Trying to reconnect node [{self._identifier}] in {round(retry)}s")
@@ -232,9 +285,14 @@ class Node:
 
         if op == "ready":
             self._session_id = data.get("sessionId")
+            self._resumed = data.get("resumed", False)
+            self._ready.set()
+            self._bot.dispatch("voicelink_session_ready", self)
+            return
 
         if op == "stats":
             self._stats = NodeStats(data)
+            self._players_moved_away = 0
             return
 
         if "guildId" in data and not (player := self._players.get(int(data["guildId"]))):
@@ -243,7 +301,7 @@ class Node:
         if op == "event":
             await player._dispatch_event(data)
         elif op == "playerUpdate":
-            await player._update_state(data)
+            player._update_state(data)
 
     async def send(self, method: RequestMethod, query: str, data: dict | str | None = None) -> dict:
         if data is None:
@@ -251,20 +309,20 @@ class Node:
         if not self._available:
             raise NodeNotAvailable(f"The node '{self._identifier}' is unavailable.")
 
+        codec = get_codec()
         uri: str = f"{self._rest_uri}/{NODE_VERSION}/{query}"
         async with self._session.request(
             method=method.value,
             url=uri,
-            headers={"Authorization": self._password},
-            json=data,
+            headers={"Authorization": self._password, "Content-Type": "application/json"},
+            data=codec.dumpb(data),
         ) as resp:
             if resp.status >= 300:
                 raise NodeException("Getting errors from Lavalink REST api")
 
-            if method == RequestMethod.DELETE:
-                return await resp.json(content_type=None)
-
-            return await resp.json()
+            # Decode the raw body directly, a DELETE answers with an empty one
+            body = await resp.read()
+            return codec.loads(body) if body else None
 
     async def connect(self) -> Node:
         """Initiates a connection with a Lavalink node and adds it to the node pool."""
@@ -273,28 +331,60 @@ class Node:
                 self._logger.info(f"Node [{self._identifier}] already connected.")
                 return None
 
+            # Ask Lavalink to resume the previous session, it keeps the players running if it is still alive
+            headers = self._headers.copy()
+            if self.resume_timeout and self._session_id:
+                headers["Session-Id"] = self._session_id
+
+            self._ready.clear()
             self._websocket = await self._session.ws_connect(
-                self._websocket_uri, headers=self._headers, heartbeat=self._heartbeat
+                self._websocket_uri, headers=headers, heartbeat=self._heartbeat
             )
 
+            # The ready payload goes through the listener and the dispatcher
             self._task = self._bot.loop.create_task(self._listen())
+            self._dispatcher.start()
+            await asyncio.wait_for(self._ready.wait(), timeout=10)
+
             self._available = True
+            self._prober.start()
             self._info = NodeInfo(await self.send(RequestMethod.GET, query="info"))
+            await self._configure_resuming()
 
             self._logger.info(f"Node [{self._identifier}] is connected!")
 
-        except aiohttp.ClientConnectorError:
-            raise NodeConnectionFailure(f"The connection to node '{self._identifier}' failed.")
-        except aiohttp.WSServerHandshakeError:
-            raise NodeConnectionFailure(f"The password for node '{self._identifier}' is invalid.")
-        except aiohttp.InvalidURL:
-            raise NodeConnectionFailure(f"The URI for node '{self._identifier}' is invalid.")
+            if self._failover_task:
+                self._failover_task.cancel()
+                self._failover_task = None
+
+        except aiohttp.ClientConnectorError as e:
+            raise NodeConnectionFailure(f"The connection to node '{self._identifier}' failed.") from e
+        except aiohttp.WSServerHandshakeError as e:
+            raise NodeConnectionFailure(f"The password for node '{self._identifier}' is invalid.") from e
+        except aiohttp.InvalidURL as e:
+            raise NodeConnectionFailure(f"The URI for node '{self._identifier}' is invalid.") from e
+        except TimeoutError as e:
+            await self._abort_connect()
+            raise NodeConnectionFailure(f"The node '{self._identifier}' did not send a ready payload.") from e
 
         if self.players:
             await self.reconnect()
 
+        if self.failback:
+            self._bot.loop.create_task(self._failback())
+
         return self
 
+    async def _abort_connect(self) -> None:
+        # Leave nothing running for a connection that never became ready
+        self._available = False
+        self._prober.stop()
+        self._dispatcher.stop()
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if self._websocket:
+            await self._websocket.close()
+
     async def disconnect(self, remove_from_pool: bool = False) -> None:
         """
         Disconnects a connected Lavalink node and removes it from the node pool.
@@ -308,28 +398,177 @@ class Node:
             del self._pool._nodes[self._identifier]
         self._available = False
         self._task.cancel()
+        self._prober.stop()
+        self._dispatcher.stop()
 
         self._logger.info(f"Node [{self._identifier}] is disconnected!")
 
-    async def reconnect(self) -> None:
-        await asyncio.sleep(10)
-        for player in self.players.copy().values():
-            await asyncio.sleep(3)
+    async def _configure_resuming(self) -> None:
+        """Enable session resuming and collect the players Lavalink kept alive from the previous session."""
+        self._resumed_players.clear()
+        if not self.resume_timeout:
+            return
+
+        await self.send(
+            RequestMethod.PATCH,
+            query=f"sessions/{self._session_id}",
+            data={"resuming": True, "timeout": self.resume_timeout},
+        )
+
+        if not self._resumed:
+            return
+
+        players = await self.send(RequestMethod.GET, query=f"sessions/{self._session_id}/players")
+        self._resumed_players = {int(data["guildId"]): data for data in players if data.get("track")}
+        self._logger.info(
+            f"Node [{self._identifier}] resumed its session with {len(self._resumed_players)} active player(s)."
+        )
+
+        if self._resumed_players:
+            self._bot.loop.create_task(self._expire_resumed_players())
+
+    def claim_resumed_player(self, guild_id: int) -> dict | None:
+        """Return the Lavalink state of a player kept alive by a resumed session, if it has not been claimed yet."""
+        return self._resumed_players.pop(guild_id, None)
+
+    async def _expire_resumed_players(self) -> None:
+        # Players nobody claimed would otherwise keep playing into a channel without a controller
+        await asyncio.sleep(self.resume_timeout)
+        for guild_id in list(self._resumed_players):
+            if not self._resumed_players.pop(guild_id, None) or guild_id in self._players:
+                continue
+
             try:
-                if player._voice_state:
-                    await player._dispatch_voice_update(player._voice_state)
+                await self.send(RequestMethod.DELETE, query=f"sessions/{self._session_id}/players/{guild_id}")
+            except Exception as e:
+                self._logger.error(
+                    f"Failed to destroy resumed player {guild_id} on node [{self._identifier}]", exc_info=e
+                )
+
+    async def _recover_player(self, player: Player) -> None:
+        if (state := self.claim_resumed_player(player.guild.id)) and player._sync_resumed_state(state):
+            return
 
-                if player.current:
-                    await player.play(
-                        track=player.current,
-                        start=min(player._last_position, player.current.length),
-                    )
+        if player._voice_state:
+            await player._dispatch_voice_update(player._voice_state)
 
-                    if player.is_paused:
-                        await player.set_pause(True)
-            except:
-                await player.teardown()
-            await asyncio.sleep(2)
+        if player.current:
+            await player.play(
+                track=player.current,
+                start=min(player._last_position, player.current.length),
+            )
+
+            if player.is_paused:
+                await player.set_pause(True)
+
+    async def reconnect(self) -> None:
+        """
+        Restores every player on this node after its websocket reconnected.
+
+        Players are restored concurrently, at most `recovery_concurrency` at a time and
+        paced to `recovery_rate` players per second, starting with the most recently active ones.
+        Players the node kept alive through a resumed session only have their state synced.
+        """
+        await asyncio.sleep(self.recovery_delay)
+
+        players = sorted(
+            self.players.values(),
+            key=lambda player: (player.current is not None and not player.is_paused, player._last_update),
+            reverse=True,
+        )
+        if not players:
+            return
+
+        semaphore = asyncio.Semaphore(self.recovery_concurrency)
+        bucket = TokenBucket(rate=self.recovery_rate, capacity=self.recovery_concurrency)
+        report_every = max(1, len(players) // 10)
+        restored = failed = 0
+
+        async def recover(player: Player) -> None:
+            nonlocal restored, failed
+            async with semaphore:
+                await bucket.acquire()
+                try:
+                    await self._recover_player(player)
+                    restored += 1
+                except Exception:
+                    failed += 1
+                    await player.teardown()
+
+            if (done := restored + failed) % report_every == 0 or done == len(players):
+                self._logger.info(
+                    f"Recovering players on node [{self._identifier}]: {done}/{len(players)} ({failed} failed)"
+                )
+
+        await asyncio.gather(*(recover(player) for player in players))
+
+    async def migrate_players(
+        self, players: list[Player], identifier: str | None = None, *, resume_at_last_position: bool = False
+    ) -> int:
+        """
+        Move players to another node with `Player.change_node`.
+
+        At most `failover_concurrency` moves run at once, paced to `failover_rate` per second.
+        Without an identifier each player goes to the node with the lowest load at the time it is moved.
+        Returns how many players were moved.
+        """
+        semaphore = asyncio.Semaphore(self.failover_concurrency)
+        bucket = TokenBucket(rate=self.failover_rate, capacity=self.failover_concurrency)
+        moved = 0
+
+        async def move(player: Player) -> None:
+            nonlocal moved
+            async with semaphore:
+                await bucket.acquire()
+                try:
+                    target = identifier or self._pool.get_best_node(algorithm=NodeAlgorithm.BY_LOAD)._identifier
+                except NoNodesAvailable:
+                    return
+
+                position = None
+                if resume_at_last_position and player.current:
+                    position = min(player._last_position, player.current.length)
+
+                try:
+                    await player.change_node(target, position=position)
+                    moved += 1
+                except Exception as e:
+                    self._logger.error(f"Failed to move player {player.guild.id} to node [{target}]", exc_info=e)
+
+        await asyncio.gather(*(move(player) for player in players))
+        return moved
+
+    async def _failover(self) -> None:
+        await asyncio.sleep(self.failover_grace_period)
+        if self._available or not self._players:
+            return
+
+        players = list(self._players.values())
+        for player in players:
+            player._failover_from = self._identifier
+
+        self._logger.warning(
+            f"Node [{self._identifier}] is still unavailable, moving {len(players)} player(s) to other nodes."
+        )
+        moved = await self.migrate_players(players, resume_at_last_position=True)
+        self._logger.info(f"Moved {moved}/{len(players)} player(s) away from node [{self._identifier}].")
+
+    async def _failback(self) -> None:
+        players = [
+            player
+            for node in self._pool._nodes.values()
+            if node is not self
+            for player in node.players.values()
+            if player._failover_from == self._identifier
+        ]
+        if not players:
+            return
+
+        for player in players:
+            player._failover_from = None
+
+        moved = await self.migrate_players(players, self._identifier)
+        self._logger.info(f"Moved {moved}/{len(players)} player(s) back to node [{self._identifier}].")
 
     async def build_track(self, identifier: str, requester: Member = None) -> Track:
         """
@@ -405,8 +644,8 @@ class Node:
         async with self._session.request(
             method="POST",
             url=uri,
-            headers={"Authorization": self._password},
-            json={"refreshToken": token.token},
+            headers={"Authorization": self._password, "Content-Type": "application/json"},
+            data=get_codec().dumpb({"refreshToken": token.token}),
         ) as resp:
             if resp.status >= 300:
                 raise NodeException("Getting errors from Lavalink REST api")
@@ -447,6 +686,8 @@ class NodePool:
         Use NodeAlgorithm.BY_PLAYERS if you want to get the best node
         based on how players it has. This method will return a node with
         the least amount of players.
+        Use NodeAlgorithm.BY_LOAD if you want to get the node with the most
+        spare capacity, based on the load stats reported by each node.
         """
         available_nodes = [node for node in cls._nodes.values() if node._available]
 
@@ -454,12 +695,26 @@ class NodePool:
             raise NoNodesAvailable("There are no nodes available.")
 
         if algorithm == NodeAlgorithm.BY_PING:
-            tested_nodes = {node: node.latency for node in available_nodes}
-            return min(tested_nodes, key=tested_nodes.get)
+            # Nodes that have not been measured yet are only picked when nothing else is known
+            return min(
+                available_nodes,
+                key=lambda node: node._prober.latency if node._prober.latency is not None else float("inf"),
+            )
 
         if algorithm == NodeAlgorithm.BY_PLAYERS:
             tested_nodes = {node: len(node.players.keys()) for node in available_nodes}
             return min(tested_nodes, key=tested_nodes.get)
+
+        if algorithm == NodeAlgorithm.BY_LOAD:
+            return min(available_nodes, key=lambda node: node.penalty)
+        return None
+
+    @classmethod
+    def get_resumed_node(cls, guild_id: int) -> Node | None:
+        """Fetch the available node whose resumed session still holds an unclaimed player for the guild, if any."""
+        for node in cls._nodes.values():
+            if node._available and guild_id in node._resumed_players:
+                return node
         return None
 
     @classmethod
@@ -491,8 +746,12 @@ class NodePool:
         secure: bool = False,
         heartbeat: int = 30,
         yt_ratelimit: dict | None = None,
+        recovery: dict | None = None,
+        failover: dict | None = None,
+        resuming: dict | None = None,
+        dispatcher: dict | None = None,
         session: aiohttp.ClientSession | None = None,
-        resume_key: str | None = None,
+        session_id: str | None = None,
         logger: logging.Logger | None = None,
     ) -> Node:
         """Creates a Node object to be then added into the node pool."""
@@ -512,11 +771,135 @@ class NodePool:
             secure=secure,
             heartbeat=heartbeat,
             yt_ratelimit=yt_ratelimit,
+            recovery=recovery,
+            failover=failover,
+            resuming=resuming,
+            dispatcher=dispatcher,
             session=session,
-            resume_key=resume_key,
+            session_id=session_id,
             logger=logger,
         )
 
         await node.connect()
         cls._nodes[node._identifier] = node
         return node
+
+
+class NodeRebalancer:
+    """
+    Periodically moves players from overloaded nodes to nodes with spare capacity.
+
+    A node becomes hot once its load penalty reaches `hot_penalty` and only cools
+    down again below `cool_penalty`, and a moved player is left alone for `cooldown`
+    seconds, so players do not flap between nodes. At most `max_moves` players are
+    moved per interval. Paused and idle players are moved right away, playing ones
+    are moved at their next track boundary.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 60.0,
+        max_moves: int = 2,
+        hot_penalty: float = 150.0,
+        cool_penalty: float = 100.0,
+        margin: float = 50.0,
+        cooldown: float = 600.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.interval: float = interval
+        self.max_moves: int = max_moves
+        self.hot_penalty: float = hot_penalty
+        self.cool_penalty: float = cool_penalty
+        self.margin: float = margin
+        self.cooldown: float = cooldown
+
+        self._logger: logging.Logger = logger or logging.getLogger("voicelink")
+        self._hot: set[str] = set()
+        self._moved_at: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start rebalancing every `interval` seconds if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop rebalancing."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.rebalance()
+            except Exception as e:
+                self._logger.error("Error occurred while rebalancing players across nodes!", exc_info=e)
+
+    def _pick_player(self, node: Node, now: float) -> Player | None:
+        candidates = [
+            player
+            for player in node.players.values()
+            if player._pending_node is None
+            and now - self._moved_at.get(player.guild.id, -self.cooldown) >= self.cooldown
+        ]
+        if not candidates:
+            return None
+
+        # Prefer players that can move without interrupting audio, then those closest to a track boundary
+        def impact(player: Player) -> tuple[bool, float]:
+            if player.is_paused or player.current is None:
+                return False, 0
+            return True, player.current.length - player.position
+
+        return min(candidates, key=impact)
+
+    async def rebalance(self) -> int:
+        """Run a single rebalancing pass. Returns how many players were moved or scheduled to move."""
+        nodes = [node for node in NodePool._nodes.values() if node._available]
+        if len(nodes) < 2:
+            return 0
+
+        penalties = {node: node.penalty for node in nodes}
+        for node, penalty in penalties.items():
+            if penalty >= self.hot_penalty:
+                self._hot.add(node._identifier)
+            elif penalty <= self.cool_penalty:
+                self._hot.discard(node._identifier)
+
+        now = time.monotonic()
+        self._moved_at = {
+            guild_id: moved_at for guild_id, moved_at in self._moved_at.items() if now - moved_at < self.cooldown
+        }
+
+        moves = 0
+        for node in sorted(nodes, key=penalties.get, reverse=True):
+            if node._identifier not in self._hot:
+                continue
+
+            while moves < self.max_moves:
+                target = min(penalties, key=penalties.get)
+                if target is node or penalties[target] + self.margin > penalties[node]:
+                    break
+
+                if not (player := self._pick_player(node, now)):
+                    break
+
+                self._moved_at[player.guild.id] = now
+                penalties[target] += 1
+                penalties[node] -= 1
+                moves += 1
+
+                if player.is_paused or player.current is None:
+                    await player.change_node(target._identifier)
+                else:
+                    player._pending_node = target._identifier
+
+                self._logger.info(
+                    f"Rebalancing player {player.guild.id} "
+                    f"from node [{node._identifier}] to node [{target._identifier}]"
+                )
+
+        return moves
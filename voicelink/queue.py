@@ -22,8 +22,13 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from __future__ import annotations
+
+from collections import deque
 from collections.abc import Callable
-from itertools import cycle
+from functools import wraps
+from itertools import cycle, islice
+from typing import Any
 
 from discord import Member
 
@@ -56,9 +61,12 @@ class LoopTypeCycle:
 
 
 class Queue:
+    # The queue is split into the tracks that have been played (the last one being the
+    # current track) and the upcoming tracks, so consuming and appending tracks never
+    # needs to shift or slice the whole queue.
     def __init__(self, size: int, allow_duplicate: bool, get_msg: Callable[[str], str]) -> None:
-        self._queue: list[Track] = []
-        self._position: int = 0
+        self._history: list[Track] = []
+        self._upcoming: deque[Track] = deque()
         self._size: int = size
         self._repeat: LoopTypeCycle = LoopTypeCycle()
         self._repeat_position: int = 0
@@ -66,127 +74,180 @@ class Queue:
 
         self.get_msg = get_msg
 
+    @property
+    def _position(self) -> int:
+        return len(self._history)
+
+    @_position.setter
+    def _position(self, value: int) -> None:
+        value = max(value, 0)
+        if value > len(self._history):
+            self._advance(value - len(self._history))
+        else:
+            self._rewind(len(self._history) - value)
+
+    def _advance(self, amount: int) -> None:
+        history, upcoming = self._history, self._upcoming
+        for _ in range(min(amount, len(upcoming))):
+            history.append(upcoming.popleft())
+
+    def _rewind(self, amount: int) -> None:
+        if amount <= 0:
+            return
+
+        tail = self._history[-amount:]
+        del self._history[-amount:]
+        self._upcoming.extendleft(reversed(tail))
+
+    def _check_size(self) -> None:
+        if self.count >= self._size:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+
+    def _locate(self, index: int) -> tuple[list[Track] | deque[Track], int]:
+        # Resolves an index relative to the current track (0 is the current track,
+        # 1 is the next one) into the container holding it.
+        if index > 0:
+            if index > len(self._upcoming):
+                raise IndexError(index)
+            return self._upcoming, index - 1
+
+        if -index >= len(self._history):
+            raise IndexError(index)
+        return self._history, len(self._history) - 1 + index
+
     def get(self) -> Track | None:
-        track = None
-        try:
-            track = self._queue[self._position - 1 if self._repeat.mode == LoopType.TRACK else self._position]
-            if self._repeat.mode != LoopType.TRACK:
-                self._position += 1
-        except:
-            if self._repeat.mode == LoopType.QUEUE:
-                try:
-                    track = self._queue[self._repeat_position]
-                    self._position = self._repeat_position + 1
-                except IndexError:
-                    self._repeat.set_mode(LoopType.OFF)
+        if self._repeat.mode == LoopType.TRACK and self._history:
+            return self._history[-1]
 
-        return track
+        if self._upcoming:
+            track = self._upcoming.popleft()
+            self._history.append(track)
+            return track
+
+        if self._repeat.mode == LoopType.QUEUE:
+            if self._repeat_position < len(self._history):
+                self._rewind(len(self._history) - self._repeat_position)
+                return self.get()
+
+            self._repeat.set_mode(LoopType.OFF)
+
+        return None
 
     def put(self, item: Track) -> int:
-        if self.count >= self._size:
-            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+        self._check_size()
 
-        self._queue.append(item)
+        self._upcoming.append(item)
         return self.count
 
-    def put_at_front(self, item: Track) -> int:
-        if self.count >= self._size:
+    def put_many(self, items: list[Track], *, at_front: bool = False) -> list[Track]:
+        """Add as many of the tracks as fit in one step and return the ones that were added."""
+        items = items[: max(self._size - self.count, 0)]
+        if not items:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        self._queue.insert(self._position, item)
+        if at_front:
+            self._upcoming.extendleft(reversed(items))
+        else:
+            self._upcoming.extend(items)
+        return items
+
+    def put_at_front(self, item: Track) -> int:
+        self._check_size()
+
+        self._upcoming.appendleft(item)
         return 1
 
     def put_at_index(self, index: int, item: Track) -> None:
-        if self.count >= self._size:
-            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+        self._check_size()
 
-        return self._queue.insert(self._position - 1 + index, item)
+        return self._upcoming.insert(max(index - 1, 0), item)
 
     def skipto(self, index: int) -> None:
         if not 0 < index <= self.count:
             raise OutofList(self.get_msg("voicelinkOutofList"))
-        self._position += index - 1
+        self._advance(index - 1)
 
     def backto(self, index: int) -> None:
         if not self._position - index >= 0:
             raise OutofList(self.get_msg("voicelinkOutofList"))
-        self._position -= index
+        self._rewind(index)
 
     def history_clear(self, is_playing: bool) -> None:
-        self._queue[: self._position - 1 if is_playing else self._position] = []
-        self._position = 1 if is_playing else 0
+        self._history = self._history[-1:] if is_playing else []
 
     def clear(self) -> None:
-        del self._queue[self._position :]
+        self._upcoming.clear()
 
     def replace(self, queue_type: str, replacement: list) -> None:
         if queue_type == "queue":
-            self.clear()
-            self._queue += replacement
+            self._upcoming = deque(replacement)
         elif queue_type == "history":
-            self._queue[: self._position] = replacement
+            self._history = list(replacement)
 
     def swap(self, track_index1: int, track_index2: int) -> tuple[Track, Track]:
         try:
-            adjusted_position = self._position - 1
-            (
-                self._queue[adjusted_position + track_index1],
-                self._queue[adjusted_position + track_index2],
-            ) = (
-                self._queue[adjusted_position + track_index2],
-                self._queue[adjusted_position + track_index1],
-            )
-            return self._queue[adjusted_position + track_index1], self._queue[adjusted_position + track_index2]
+            container1, index1 = self._locate(track_index1)
+            container2, index2 = self._locate(track_index2)
         except IndexError:
             raise OutofList(self.get_msg("voicelinkOutofList"))
 
+        container1[index1], container2[index2] = container2[index2], container1[index1]
+        return container1[index1], container2[index2]
+
     def move(self, target: int, to: int) -> Track | None:
         if not 0 < target <= self.count or not to > 0:
             raise OutofList(self.get_msg("voicelinkOutofList"))
 
-        try:
-            item = self._queue[self._position + target - 1]
-            self._queue.remove(item)
-            self.put_at_index(to, item)
-            return item
-        except:
-            raise OutofList(self.get_msg("voicelinkOutofList"))
+        item = self._upcoming[target - 1]
+        del self._upcoming[target - 1]
+        self._upcoming.insert(to - 1, item)
+        return item
 
     def remove(self, index: int, index2: int | None = None, member: Member = None) -> dict[int, Track]:
-        pos = self._position - 1
-
         if index2 is None:
             index2 = index
 
         elif index2 < index:
             index, index2 = index2, index
 
-        try:
-            removed_tracks: dict[str, Track] = {}
-            for i, track in enumerate(self._queue[pos + index : pos + index2 + 1]):
-                if member and track.requester != member:
-                    continue
+        start = max(index - 1, 0)
+        selected = list(islice(self._upcoming, start, index2))
+        if not selected:
+            raise OutofList(self.get_msg("voicelinkOutofList"))
 
-                self._queue.remove(track)
-                removed_tracks[pos + index + i] = track
+        removed_tracks: dict[int, Track] = {}
+        kept_tracks: list[Track] = []
+        offset = self._position + start
+        for i, track in enumerate(selected):
+            if member and track.requester != member:
+                kept_tracks.append(track)
+                continue
 
-            return removed_tracks
-        except:
-            raise OutofList(self.get_msg("voicelinkOutofList"))
+            removed_tracks[offset + i] = track
+
+        if removed_tracks:
+            upcoming = self._upcoming
+            upcoming.rotate(-start)
+            for _ in range(len(selected)):
+                upcoming.popleft()
+            upcoming.extendleft(reversed(kept_tracks))
+            upcoming.rotate(start)
+
+        return removed_tracks
 
     def history(self, incTrack: bool = False) -> list[Track]:
         if incTrack:
-            return self._queue[: self._position]
-        return self._queue[: self._position - 1]
+            return self._history.copy()
+        return self._history[:-1]
 
     def tracks(self, incTrack: bool = False) -> list[Track]:
-        if incTrack:
-            return self._queue[self._position - 1 :]
-        return self._queue[self._position :]
+        if incTrack and self._history:
+            return [self._history[-1], *self._upcoming]
+        return list(self._upcoming)
 
     @property
     def count(self) -> int:
-        return len(self._queue[self._position :])
+        return len(self._upcoming)
 
     @property
     def repeat(self) -> str:
@@ -194,34 +255,116 @@ class Queue:
 
     @property
     def is_empty(self) -> bool:
-        try:
-            self._queue[self._position]
-        except:
-            return True
-        return False
+        return not self._upcoming
+
+
+def _invalidates_index(method: Callable) -> Callable:
+    @wraps(method)
+    def wrapper(self: FairQueue, *args, **kwargs) -> Any:
+        self._requester_index = None
+        return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class FairQueue(Queue):
+    # Tracks are interleaved so every requester gets a turn before anyone plays twice.
+    # The position of each requester's last track is kept in an index relative to the
+    # upcoming tracks (-1 being the current track), so placing a track only scans the
+    # next round instead of the whole queue. Operations that reorder the queue drop
+    # the index and it is rebuilt on the next insert.
     def __init__(self, size: int, allow_duplicate: bool, get_msg) -> None:
         super().__init__(size, allow_duplicate, get_msg)
-        self._set = set()
+        self._requester_index: dict[Member, int] | None = None
+
+    def _get_requester_index(self) -> dict[Member, int]:
+        if self._requester_index is None:
+            index = self._requester_index = {}
+            if self._history:
+                index[self._history[-1].requester] = -1
+
+            for position, track in enumerate(self._upcoming):
+                index[track.requester] = position
+
+        return self._requester_index
+
+    def _fair_position(self, requester: Member) -> int:
+        index = self._get_requester_index()
+        upcoming = self._upcoming
+        current = self._history[-1] if self._history else None
+
+        position = index[requester] + 1 if requester in index else (-1 if current else 0)
+        seen = set()
+        while position < len(upcoming):
+            track = current if position < 0 else upcoming[position]
+            if track.requester in seen:
+                break
+
+            seen.add(track.requester)
+            position += 1
+
+        return position
+
+    def _insert(self, item: Track) -> int:
+        # O(n) per insert, not O(log n): deque.insert shifts the tracks behind the position and the
+        # index update below walks every requester. Placement must match the scan rule above, which a
+        # round-based structure would not.
+        position = self._fair_position(item.requester)
+        self._upcoming.insert(position, item)
+
+        index = self._requester_index
+        for requester, last_position in index.items():
+            if last_position >= position:
+                index[requester] = last_position + 1
+        index[item.requester] = position
+
+        return position + (1 if self._history else 0)
+
+    def get(self) -> Track | None:
+        """Advance to the next track, keeping the requester index in step with the queue."""
+        history_size, upcoming_size = len(self._history), len(self._upcoming)
+        track = super().get()
+
+        if self._requester_index is not None:
+            if len(self._history) == history_size + 1 and len(self._upcoming) == upcoming_size - 1:
+                # The queue moved forward by one track, shift the index along with it.
+                self._requester_index = {
+                    requester: position - 1 for requester, position in self._requester_index.items() if position >= 0
+                }
+            elif len(self._history) != history_size:
+                self._requester_index = None
+
+        return track
 
     def put(self, item: Track) -> int:
-        if len(self._queue) >= self._size:
+        if self._position + self.count >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        tracks = self.tracks(incTrack=True)
-        lastIndex = len(tracks)
-        for track in reversed(tracks):
-            if track.requester == item.requester:
-                break
-            lastIndex -= 1
-        self._set.clear()
-        for track in tracks[lastIndex:]:
-            if track.requester in self._set:
-                break
-            lastIndex += 1
-            self._set.add(track.requester)
+        return self._insert(item)
+
+    def put_many(self, items: list[Track], *, at_front: bool = False) -> list[Track]:
+        """Add as many of the tracks as fit, interleaving them by requester unless they go to the front."""
+        if at_front:
+            self._requester_index = None
+            return super().put_many(items, at_front=True)
+
+        items = items[: max(self._size - self._position - self.count, 0)]
+        if not items:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        self.put_at_index(lastIndex, item)
-        return lastIndex
+        for item in items:
+            self._insert(item)
+
+        return items
+
+    put_at_front = _invalidates_index(Queue.put_at_front)
+    put_at_index = _invalidates_index(Queue.put_at_index)
+    skipto = _invalidates_index(Queue.skipto)
+    backto = _invalidates_index(Queue.backto)
+    history_clear = _invalidates_index(Queue.history_clear)
+    clear = _invalidates_index(Queue.clear)
+    replace = _invalidates_index(Queue.replace)
+    swap = _invalidates_index(Queue.swap)
+    move = _invalidates_index(Queue.move)
+    remove = _invalidates_index(Queue.remove)
+    _position = property(Queue._position.fget, _invalidates_index(Queue._position.fset))
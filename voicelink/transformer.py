@@ -24,10 +24,14 @@ SOFTWARE.
 
 import struct
 from base64 import b64decode, b64encode
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Mapping
 from io import BytesIO
 from typing import Any, Final
 
+from bson import Binary
+
+from .utils import LRUCache
+
 
 V2_KEYSET = {
     "title",
@@ -40,6 +44,16 @@ V2_KEYSET = {
     "position",
 }
 V3_KEYSET = V2_KEYSET | {"artworkUrl", "isrc"}
+_ENCODE_KEYS: Final[tuple[str, ...]] = tuple(sorted(V3_KEYSET))
+
+_INT: Final[struct.Struct] = struct.Struct(">i")
+_UNSIGNED_SHORT: Final[struct.Struct] = struct.Struct(">H")
+_LONG: Final[struct.Struct] = struct.Struct(">Q")
+
+# Process-wide caches shared by every decode/encode call. Decoded entries are handed
+# out as shallow copies so callers can freely mutate the returned dict.
+DECODE_CACHE: Final[LRUCache] = LRUCache(maxsize=5000)
+ENCODE_CACHE: Final[LRUCache] = LRUCache(maxsize=5000)
 
 
 class _MissingObj:
@@ -55,8 +69,8 @@ MISSING: Any = _MissingObj()
 class DataReader:
     __slots__ = ("_buf", "_mark")
 
-    def __init__(self, base64_str: str):
-        self._buf: Final[BytesIO] = BytesIO(b64decode(base64_str))
+    def __init__(self, base64_str: str | bytes):
+        self._buf: Final[BytesIO] = BytesIO(pack_track_id(base64_str))
         self._mark: int | None = None
 
     @property
@@ -264,6 +278,87 @@ def read_utfm(utf_len: int, utf_bytes: bytes) -> str:
     return "".join(chars).encode("utf-16", "surrogatepass").decode("utf-16")
 
 
+def _read_utfm_fast(utf_bytes: bytes) -> str:
+    # Most titles are plain ASCII, and modified UTF-8 only differs from UTF-8 for
+    # NUL and supplementary characters, so the char loop is the last resort.
+    if utf_bytes.isascii():
+        return utf_bytes.decode("ascii")
+
+    try:
+        return utf_bytes.decode("utf8")
+    except UnicodeDecodeError:
+        return read_utfm(len(utf_bytes), utf_bytes)
+
+
+def _decode_buffer(buf: bytes) -> dict:
+    unpack_short = _UNSIGNED_SHORT.unpack_from
+
+    (flags,) = _INT.unpack_from(buf)
+    if (flags & 0xC0000000) >> 30 & 1 != 0:
+        version, offset = buf[4], 5
+    else:
+        version, offset = 1, 4
+
+    (text_length,) = unpack_short(buf, offset)
+    offset += 2
+    title = _read_utfm_fast(buf[offset : offset + text_length])
+    offset += text_length
+
+    (text_length,) = unpack_short(buf, offset)
+    offset += 2
+    author = _read_utfm_fast(buf[offset : offset + text_length])
+    offset += text_length
+
+    (length,) = _LONG.unpack_from(buf, offset)
+    offset += 8
+
+    (text_length,) = unpack_short(buf, offset)
+    offset += 2
+    identifier = buf[offset : offset + text_length].decode()
+    offset += text_length
+
+    is_stream = buf[offset] != 0
+    offset += 1
+
+    nullable_fields = []
+    for _ in range(3 if version == 3 else 1):
+        if buf[offset] == 0:
+            nullable_fields.append(None)
+            offset += 1
+            continue
+
+        (text_length,) = unpack_short(buf, offset + 1)
+        offset += 3
+        nullable_fields.append(buf[offset : offset + text_length].decode())
+        offset += text_length
+
+    (text_length,) = unpack_short(buf, offset)
+    offset += 2
+    source = buf[offset : offset + text_length].decode()
+
+    # The position is always the trailing long of the message, so source specific
+    # fields can be skipped without parsing them.
+    (position,) = _LONG.unpack_from(buf, len(buf) - 8)
+
+    track = {
+        "title": title,
+        "author": author,
+        "length": length,
+        "identifier": identifier,
+        "isStream": is_stream,
+        "uri": nullable_fields[0],
+        "isSeekable": not is_stream,
+        "sourceName": source,
+        "position": position,
+    }
+
+    if version == 3:
+        track["artworkUrl"] = nullable_fields[1]
+        track["isrc"] = nullable_fields[2]
+
+    return track
+
+
 def _read_track_common(
     reader: DataReader,
 ) -> tuple[str, str, int, str, bool, str | None]:
@@ -285,14 +380,27 @@ def _write_track_common(track: dict[str, Any], writer: DataWriter) -> None:
     writer.write_nullable_utf(track["uri"])
 
 
+def pack_track_id(track_id: str | bytes) -> Binary:
+    """Convert a base64 track ID into the BSON Binary form it is stored as."""
+    if isinstance(track_id, Binary):
+        return track_id
+    return Binary(track_id if isinstance(track_id, bytes) else b64decode(track_id))
+
+
+def unpack_track_id(track: str | bytes) -> str:
+    """Return the base64 form of a stored track ID, whichever format it was stored in."""
+    return b64encode(track).decode() if isinstance(track, bytes) else track
+
+
 def decode(
-    track: str,
+    track: str | bytes,
     source_decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]] = MISSING,
 ) -> dict:
-    decoders = DEFAULT_DECODER_MAPPING.copy()
+    if source_decoders is MISSING:
+        return _decode_cached(track)
 
-    if source_decoders is not MISSING:
-        decoders.update(source_decoders)
+    decoders = DEFAULT_DECODER_MAPPING.copy()
+    decoders.update(source_decoders)
 
     reader = DataReader(track)
 
@@ -328,12 +436,31 @@ def decode(
     }
 
 
+def _decode_cached(track: str | bytes) -> dict:
+    if (info := DECODE_CACHE.get(track)) is None:
+        info = _decode_buffer(pack_track_id(track))
+        DECODE_CACHE.put(track, info)
+
+    return info.copy()
+
+
+def decode_many(track_ids: Iterable[str | bytes]) -> list[dict]:
+    """Decode a batch of track IDs in a single pass, returning them in the same order."""
+    return [_decode_cached(track_id) for track_id in track_ids]
+
+
 def encode(
     track: dict[str, Any],
     source_encoders: Mapping[str, Callable[[DataWriter, dict[str, Any]], None]] = MISSING,
 ) -> str:
     assert track.keys() >= V3_KEYSET
 
+    cache_key = None
+    if source_encoders is MISSING:
+        cache_key = tuple(track[key] for key in _ENCODE_KEYS)
+        if (track_id := ENCODE_CACHE.get(cache_key)) is not None:
+            return track_id
+
     writer = DataWriter()
     version = struct.pack("B", 3)
     writer.write_byte(version)
@@ -348,4 +475,9 @@ def encode(
     writer.write_long(track["position"])
 
     enc = writer.finish()
-    return b64encode(enc).decode()
+    track_id = b64encode(enc).decode()
+
+    if cache_key is not None:
+        ENCODE_CACHE.put(cache_key, track_id)
+
+    return track_id
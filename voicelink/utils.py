@@ -22,20 +22,30 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
+import contextlib
+import logging
 import random
 import socket
 import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Hashable
 from itertools import zip_longest
 from timeit import default_timer as timer
+from typing import Any
 
 
 __all__ = [
+    "EventDispatcher",
     "ExponentialBackoff",
+    "LRUCache",
+    "LatencyProber",
     "NodeInfo",
     "NodeInfoVersion",
     "NodeStats",
     "Ping",
     "Plugin",
+    "TokenBucket",
 ]
 
 
@@ -85,6 +95,287 @@ class ExponentialBackoff:
         return self._randfunc(0, self._base * 2**self._exp)
 
 
+class TokenBucket:
+    """
+    A token bucket rate limiter.
+
+    Allows bursts of up to `capacity` actions and refills `rate` tokens per second.
+    """
+
+    __slots__ = ("_last_refill", "_tokens", "capacity", "rate")
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate: float = rate
+        self.capacity: int = capacity
+        self._tokens: float = capacity
+        self._last_refill: float = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens available right now."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available without waiting."""
+        self._refill()
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while not self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class LatencyProber:
+    """
+    Measures the TCP connect time to a host in the background.
+
+    Keeps an exponentially weighted moving average of the latency and of its jitter,
+    so readers get the current estimate without doing any I/O.
+    """
+
+    def __init__(
+        self, host: str, port: int, *, interval: float = 30.0, timeout: float = 5.0, alpha: float = 0.3
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.interval: float = interval
+        self.timeout: float = timeout
+        self.alpha: float = alpha
+
+        self.latency: float | None = None
+        self.jitter: float = 0.0
+        self.last_sample: float | None = None
+        self.samples: int = 0
+        self.failures: int = 0
+
+        self._task: asyncio.Task | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<LatencyProber host={self.host}:{self.port} latency={self.latency} "
+            f"jitter={self.jitter:.2f} samples={self.samples} failures={self.failures}>"
+        )
+
+    def record(self, sample: float) -> None:
+        """Fold a latency sample in milliseconds into the moving averages."""
+        self.last_sample = sample
+        self.samples += 1
+
+        if self.latency is None:
+            self.latency = sample
+            return
+
+        self.jitter += self.alpha * (abs(sample - self.latency) - self.jitter)
+        self.latency += self.alpha * (sample - self.latency)
+
+    async def probe(self) -> float | None:
+        """Take a single sample. Returns the measured latency, or None if the host could not be reached."""
+        start = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except (OSError, TimeoutError):
+            self.failures += 1
+            return None
+
+        sample = (time.perf_counter() - start) * 1000
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+        self.record(sample)
+        return sample
+
+    def start(self) -> None:
+        """Start probing in the background if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop probing, keeping the current estimates."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+
+class EventDispatcher:
+    """
+    Runs payloads through a handler in order per key, spread across a fixed set of workers.
+
+    Each key has its own mailbox that only one worker drains at a time, so payloads for the
+    same key never overlap while different keys are still processed concurrently.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        *,
+        workers: int = 8,
+        batch_size: int = 32,
+        alpha: float = 0.1,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.handler: Callable[[Any], Awaitable[None]] = handler
+        self.workers: int = workers
+        self.batch_size: int = batch_size
+        self.alpha: float = alpha
+
+        self.processed: int = 0
+        self.lag: float = 0.0
+        self.max_lag: float = 0.0
+
+        self._logger: logging.Logger = logger or logging.getLogger("voicelink")
+        self._mailboxes: dict[Hashable, deque[tuple[float, Any]]] = {}
+        self._ready: asyncio.Queue[Hashable] = asyncio.Queue()
+        self._depth: int = 0
+        self._tasks: list[asyncio.Task] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"<Voicelink.EventDispatcher workers={self.workers} depth={self._depth} "
+            f"mailboxes={len(self._mailboxes)} lag={self.lag:.2f}ms max_lag={self.max_lag:.2f}ms>"
+        )
+
+    @property
+    def depth(self) -> int:
+        """The number of payloads waiting to be handled."""
+        return self._depth
+
+    @property
+    def mailboxes(self) -> int:
+        """The number of keys with payloads waiting or in progress."""
+        return len(self._mailboxes)
+
+    def put(self, key: Hashable, payload: Any) -> None:
+        """Queue a payload behind the others for the same key."""
+        if (mailbox := self._mailboxes.get(key)) is None:
+            mailbox = self._mailboxes[key] = deque()
+            self._ready.put_nowait(key)
+
+        mailbox.append((time.perf_counter(), payload))
+        self._depth += 1
+
+    def start(self) -> None:
+        """Start the workers that are not running."""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._run()))
+
+    def stop(self) -> None:
+        """Cancel the workers, leaving queued payloads in their mailboxes."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    async def _run(self) -> None:
+        while True:
+            key = await self._ready.get()
+            mailbox = self._mailboxes[key]
+
+            try:
+                # Handle a bounded batch, then give other keys a turn if this one is still busy
+                for _ in range(self.batch_size):
+                    if not mailbox:
+                        break
+
+                    queued_at, payload = mailbox.popleft()
+                    self._depth -= 1
+
+                    lag = (time.perf_counter() - queued_at) * 1000
+                    self.lag += self.alpha * (lag - self.lag)
+                    self.max_lag = max(self.max_lag, lag)
+
+                    try:
+                        await self.handler(payload)
+                    except Exception as e:
+                        self._logger.error(f"Error occurred while handling a payload for {key}", exc_info=e)
+
+                    self.processed += 1
+            finally:
+                if mailbox:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._mailboxes[key]
+
+    def reset_max_lag(self) -> float:
+        """Return the highest lag seen since the last reset and start tracking it again."""
+        max_lag, self.max_lag = self.max_lag, 0.0
+        return max_lag
+
+
+class LRUCache:
+    """
+    A size-bounded least recently used cache.
+
+    Keeps hit and miss counters so the cache efficiency can be inspected at runtime.
+    """
+
+    __slots__ = ("_data", "hits", "maxsize", "misses")
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return (
+            f"<Voicelink.LRUCache size={len(self._data)} maxsize={self.maxsize} hits={self.hits} misses={self.misses}>"
+        )
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value and mark it as recently used, or `default` on a miss."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond `maxsize`."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 class NodeStats:
     """
     The base class for the node stats object.
@@ -107,6 +398,31 @@ class NodeStats:
         self.players_total: int = data.get("players")
         self.uptime: int = data.get("uptime")
 
+        # Frame stats are only sent once the node has players
+        frames: dict = data.get("frameStats") or {}
+        self.frames_sent: int = frames.get("sent", 0)
+        self.frames_nulled: int = frames.get("nulled", 0)
+        self.frames_deficit: int = frames.get("deficit", 0)
+
+    @property
+    def penalty(self) -> float:
+        """
+        Load score of the node, lower is better.
+
+        Grows exponentially with CPU and memory usage and with missing or nulled audio frames,
+        on top of one point per playing player.
+        """
+        cpu_penalty = 1.05 ** (100 * (self.cpu_system_load or 0)) * 10 - 10
+
+        memory_ratio = self.used / self.reservable if self.reservable else 0
+        memory_penalty = 1.05 ** (100 * memory_ratio) * 5 - 5
+
+        # Frames are counted per minute, 3000 frames is a full minute of audio
+        deficit_penalty = 1.03 ** (500 * self.frames_deficit / 3000) * 600 - 600
+        nulled_penalty = (1.03 ** (500 * self.frames_nulled / 3000) * 300 - 300) * 2
+
+        return (self.players_active or 0) + cpu_penalty + memory_penalty + deficit_penalty + nulled_penalty
+
     def __repr__(self) -> str:
         return f"<Voicelink.NodeStats total_players={self.players_total!r} playing_active={self.players_active!r}>"
 